@@ -0,0 +1,110 @@
+"""
+FILE CACHE FOR SCRAPED DATA
+TTL-based JSON cache so reruns within minutes skip the network
+
+Each entry lives at {root}/{endpoint}/{md5(key)}.json as
+{"ts": <unix time>, "ttl": <seconds>, "data": <cached value>}
+"""
+
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+
+def cache_key(*args, **kwargs):
+    """
+    Build the cache key used by @cached for a call's arguments
+    """
+    return json.dumps([args, kwargs], sort_keys=True, default=str)
+
+
+def _to_json(value):
+    """json.dump fallback for numpy scalars (np.int64 is not a Python int)"""
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+
+class FileCache:
+    """
+    Small on-disk cache, one JSON file per (endpoint, key)
+    """
+
+    def __init__(self, root='.cache'):
+        self.root = root
+
+    def _path(self, endpoint, key):
+        digest = hashlib.md5(str(key).encode()).hexdigest()
+        return os.path.join(self.root, endpoint, f"{digest}.json")
+
+    def load(self, endpoint, key):
+        """
+        Return the raw entry even if it has expired, or None
+        """
+        try:
+            with open(self._path(endpoint, key)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def get(self, endpoint, key, default=None):
+        """
+        Return the cached data if it is still fresh
+        """
+        entry = self.load(endpoint, key)
+        if entry is None or time.time() - entry['ts'] >= entry['ttl']:
+            return default
+        return entry['data']
+
+    def set(self, endpoint, key, data, ttl):
+        """
+        Store data for ttl seconds
+        """
+        path = self._path(endpoint, key)
+        directory = os.path.dirname(path)
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+            # Write then rename so concurrent readers never see partial JSON
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'ts': time.time(), 'ttl': ttl, 'data': data},
+                          f, default=_to_json)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError):
+            # Caching is best-effort; a failed write just means a refetch
+            pass
+
+
+_MISSING = object()
+
+
+def cached(endpoint, ttl, empty=None):
+    """
+    Cache a method's result in self.cache (a FileCache, or None to disable)
+
+    The key is built from the call's arguments. Results equal to `empty`
+    (the method's "no data" fallback) are not stored, so a failed fetch is
+    retried on the next call. JSON lists come back as tuples.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = getattr(self, 'cache', None)
+            if cache is None:
+                return method(self, *args, **kwargs)
+
+            key = cache_key(*args, **kwargs)
+            data = cache.get(endpoint, key, _MISSING)
+            if data is not _MISSING:
+                return tuple(data) if isinstance(data, list) else data
+
+            result = method(self, *args, **kwargs)
+            if result != empty:
+                cache.set(endpoint, key, result, ttl)
+            return result
+        return wrapper
+    return decorator
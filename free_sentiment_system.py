@@ -12,28 +12,439 @@ Data Sources:
 All completely FREE with no registration!
 """
 
-import yfinance as yf
-import pandas as pd
-import numpy as np
+import numpy as np  # eager: the module-level score tables are arrays
 from datetime import datetime, timedelta
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 import re
-import time
+import argparse
+import functools
+import importlib
+import itertools
+import threading
 import warnings
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+try:
+    import orjson  # optional, faster JSON parsing
+except ImportError:
+    orjson = None
+try:
+    import brotli  # optional, lets urllib3 decode 'br' responses
+except ImportError:
+    brotli = None
+try:
+    import re2 as keyword_re  # optional, google-re2 DFA matcher for keywords
+except ImportError:
+    keyword_re = re
+from file_cache import FileCache, cache_key, cached
 warnings.filterwarnings('ignore')
 
+# yfinance, pandas, lxml and bs4 are imported on first use so that
+# --help and `from free_sentiment_system import ...` stay fast
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Keyword lists per source
+YAHOO_POSITIVE = ['surge', 'soar', 'rally', 'gain', 'beat', 'growth',
+                  'record', 'strong', 'bullish', 'upgrade', 'outperform',
+                  'buy', 'positive', 'breakthrough', 'success']
+YAHOO_NEGATIVE = ['drop', 'fall', 'plunge', 'loss', 'miss', 'weak',
+                  'decline', 'bearish', 'downgrade', 'concern', 'warning',
+                  'sell', 'negative', 'disappointing', 'trouble']
+FINVIZ_POSITIVE = ['surge', 'rally', 'gain', 'upgrade', 'buy', 'bullish']
+FINVIZ_NEGATIVE = ['drop', 'fall', 'downgrade', 'sell', 'bearish', 'concern']
+REDDIT_BULLISH = ['buy', 'calls', 'moon', 'yolo', 'bullish', 'long']
+REDDIT_BEARISH = ['sell', 'puts', 'bearish', 'short', 'crash']
+
+# Momentum score buckets (searchsorted lookups instead of if/elif ladders).
+# Up-moves need momentum > threshold, down-moves momentum < threshold.
+_MOMENTUM_UP_BINS = np.array([5, 10, 20])
+_MOMENTUM_UP_DELTAS = np.array([0, 5, 15, 25])
+_MOMENTUM_DOWN_BINS = np.array([-20, -10])
+_MOMENTUM_DOWN_DELTAS = np.array([-25, -15, 0])
+_VOLUME_BINS = np.array([25, 50])
+_VOLUME_DELTAS = np.array([0, 5, 10])
+
+# Analyst recommendationKey -> base score
+_REC_SCORES = MappingProxyType({
+    'strong_buy': 95,
+    'buy': 80,
+    'outperform': 80,
+    'hold': 50,
+    'underperform': 20,
+    'sell': 10,
+    'strong_sell': 5,
+    'none': 50,
+})
+
+# Score boost for analyst target upside (needs upside > threshold)
+_UPSIDE_BINS = np.array([15, 25])
+_UPSIDE_BOOSTS = np.array([0, 10, 15])
+
+# Weighted composite, in the order scores are stacked
+_WEIGHTS = np.array([
+    0.30,  # StockTwits - best free source
+    0.25,  # Analyst - professional opinion
+    0.20,  # Momentum - price action
+    0.15,  # News sentiment
+    0.05,  # Finviz - additional news
+    0.05,  # Reddit - social buzz
+])
+
+# Raw per-ticker values gathered by _collect_signals, in that order, with
+# the dtype of the array each one is stored in while screening
+_FIELDS = MappingProxyType({
+    'ticker': object,
+    'stocktwits_score': np.float64,
+    'stocktwits_bullish': np.int64,
+    'stocktwits_bearish': np.int64,
+    'stocktwits_total': np.int64,
+    'analyst_score': np.int64,
+    'analyst_recommendation': object,
+    'target_upside': np.float64,
+    'num_analysts': np.int64,
+    'momentum_score': np.int64,
+    'news_score': np.float64,
+    'news_count': np.int64,
+    'finviz_score': np.float64,
+    'reddit_mentions': np.int64,
+    'reddit_bullish': np.int64,
+    'reddit_bearish': np.int64,
+    'total_buzz': np.int64,
+})
+
+# Columns of a result row / the results frame
+_RESULT_COLUMNS = (
+    'ticker', 'composite_score', 'signal',
+    'stocktwits_score', 'stocktwits_bullish', 'stocktwits_bearish', 'stocktwits_total',
+    'analyst_score', 'analyst_recommendation', 'target_upside', 'num_analysts',
+    'momentum_score', 'news_score', 'news_count',
+    'reddit_mentions', 'reddit_bullish', 'reddit_bearish', 'total_buzz',
+)
+
+# Signal ids produced by score_batch -> labels
+_SIGNALS = np.array(['HOLD', 'BUY', 'SELL', 'STRONG_BUY'], dtype=object)
+
+# Top-N table: column -> header, and per-column number formats
+_TABLE_COLUMNS = MappingProxyType({
+    'ticker': 'Ticker',
+    'signal': 'Signal',
+    'composite_score': 'Score',
+    'stocktwits_bullish': 'ST Bull',
+    'analyst_score': 'Analyst',
+    'momentum_score': 'Mom',
+    'total_buzz': 'Buzz',
+    'target_upside': 'Upside',
+})
+_TABLE_FORMATTERS = {  # plain dict: to_string only accepts dict/list/tuple
+    'composite_score': '{:.1f}'.format,
+    'stocktwits_bullish': '{:.0f}'.format,
+    'analyst_score': '{:.1f}'.format,
+    'momentum_score': '{:.1f}'.format,
+    'total_buzz': '{:.0f}'.format,
+    'target_upside': '{:.1f}%'.format,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _yf():
+    """
+    yfinance, imported on first use (it pulls in pandas)
+    """
+    return importlib.import_module('yfinance')
+
+
+@functools.lru_cache(maxsize=None)
+def _lxml_html():
+    """
+    lxml.html if installed (optional, C parser with XPath), else None
+    """
+    try:
+        return importlib.import_module('lxml.html')
+    except ImportError:
+        return None
+
+
+@functools.lru_cache(maxsize=256)
+def _get_ticker(ticker):
+    """
+    Reuse one yf.Ticker per symbol so .info/.news are fetched once
+    """
+    return _yf().Ticker(ticker)
+
+
+def score_batch(fields):
+    """
+    Composite score and signal for a batch of tickers in one vectorized pass
+    fields maps each _FIELDS name to an array; returns (composite, signal)
+    """
+    # Reddit sentiment (neutral when nobody picked a side)
+    bull, bear = fields['reddit_bullish'], fields['reddit_bearish']
+    votes = bull + bear
+    reddit_score = np.divide(bull, votes, out=np.full(len(votes), 0.5), where=votes > 0) * 100
+    
+    # Weighted composite
+    scores = np.column_stack([fields['stocktwits_score'], fields['analyst_score'],
+                              fields['momentum_score'], fields['news_score'],
+                              fields['finviz_score'], reddit_score])
+    composite = scores @ _WEIGHTS
+    
+    # Determine signal (first matching condition wins)
+    strong_buy = ((composite >= 75) & (fields['total_buzz'] >= 15)
+                  & (fields['stocktwits_bullish'] > fields['stocktwits_bearish']))
+    signal_id = np.select([strong_buy, composite >= 65, composite <= 35], [3, 1, 2], default=0)
+    
+    return composite, np.take(_SIGNALS, signal_id)
+
+
+def _keyword_pattern(words):
+    """
+    Compile a word list into one alternation regex (RE2 when installed)
+    Only the start of a word is anchored, so 'gains' and 'surged' still count
+    """
+    return keyword_re.compile(r'\b(?:' + '|'.join(map(keyword_re.escape, words)) + ')')
+
+
+# Keyword matchers, compiled once at import (text is lowercased before
+# matching). Module globals so parse-pool processes get them on import too.
+_YAHOO_POS_RE = _keyword_pattern(YAHOO_POSITIVE)
+_YAHOO_NEG_RE = _keyword_pattern(YAHOO_NEGATIVE)
+_FINVIZ_POS_RE = _keyword_pattern(FINVIZ_POSITIVE)
+_FINVIZ_NEG_RE = _keyword_pattern(FINVIZ_NEGATIVE)
+_REDDIT_BULL_RE = _keyword_pattern(REDDIT_BULLISH)
+_REDDIT_BEAR_RE = _keyword_pattern(REDDIT_BEARISH)
+
+
+def _score_headlines(texts, pos_re, neg_re):
+    """
+    Average headline score: 75 if more distinct positive keywords, 25 if
+    more negative, 50 otherwise (and 50 when there are no headlines)
+    """
+    if not texts:
+        return 50
+    
+    # Each keyword counts once per headline, however often it repeats
+    pos = np.fromiter((len(set(pos_re.findall(t))) for t in texts), dtype=np.int32, count=len(texts))
+    neg = np.fromiter((len(set(neg_re.findall(t))) for t in texts), dtype=np.int32, count=len(texts))
+    
+    return np.where(pos > neg, 75, np.where(neg > pos, 25, 50)).mean()
+
+
+# XPath for class="... search-result ..." (same match as bs4's class_=)
+_SEARCH_RESULT_XPATH = '//div[contains(concat(" ", normalize-space(@class), " "), " search-result ")]'
+
+
+def _finviz_headlines(content):
+    """
+    Link texts from the Finviz news table, or None if the table is missing
+    Uses lxml when available, BeautifulSoup otherwise
+    """
+    lxml_html = _lxml_html()
+    if lxml_html is not None:
+        tables = lxml_html.fromstring(content).xpath('//table[@id="news-table"]')
+        if not tables:
+            return None
+        return [link.text_content() for link in tables[0].iter('a')]
+    
+    from bs4 import BeautifulSoup
+    news_table = BeautifulSoup(content, 'html.parser').find('table', {'id': 'news-table'})
+    if not news_table:
+        return None
+    return [link.text for link in news_table.find_all('a')]
+
+
+def _reddit_post_texts(content):
+    """
+    Text of every search result on an old.reddit.com search page
+    """
+    lxml_html = _lxml_html()
+    if lxml_html is not None:
+        tree = lxml_html.fromstring(content)
+        return [post.text_content() for post in tree.xpath(_SEARCH_RESULT_XPATH)]
+    
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(content, 'html.parser')
+    return [post.text for post in soup.find_all('div', class_='search-result')]
+
+
+def parse_finviz(content):
+    """
+    Score a Finviz quote page
+    Returns: (avg headline sentiment, headline count)
+    """
+    headlines = _finviz_headlines(content)
+    
+    if headlines is None:
+        return 50, 0
+    
+    texts = [headline.lower() for headline in headlines[:15]]
+    avg_sentiment = _score_headlines(texts, _FINVIZ_POS_RE, _FINVIZ_NEG_RE)
+    
+    return avg_sentiment, len(headlines)
+
+
+def parse_reddit(content):
+    """
+    Classify the posts on an old.reddit.com search page
+    Returns: (total mentions, bullish posts, bearish posts)
+    """
+    posts = _reddit_post_texts(content)
+    
+    bullish_count = 0
+    bearish_count = 0
+    
+    for post in posts[:20]:
+        title = post.lower()
+        
+        if _REDDIT_BULL_RE.search(title):
+            bullish_count += 1
+        elif _REDDIT_BEAR_RE.search(title):
+            bearish_count += 1
+    
+    return len(posts), bullish_count, bearish_count
+
+
 class FreeSentimentAnalyzer:
     """
     Sentiment analyzer using only free sources (no API keys!)
+    Responses are cached on disk in cache_dir (pass None to disable)
     """
     
-    def __init__(self):
+    def __init__(self, cache_dir='.cache'):
+        self.cache = FileCache(cache_dir) if cache_dir else None
+        self.results_file = None  # set by screen_stocks
+        
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Accept-Encoding': 'gzip, deflate, br' if brotli else 'gzip, deflate',
+            'Connection': 'keep-alive'
         })
+        
+        # Shared by all screening threads, so give it enough pooled connections.
+        # Rate limits and 5xx blips are retried with backoff (honouring
+        # Retry-After) instead of scoring the ticker as neutral.
+        retries = Retry(total=3, backoff_factor=0.3,
+                        status_forcelist=[429, 500, 502, 503, 504],
+                        respect_retry_after_header=True)
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retries)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Per-host politeness: at most 4 requests in flight to each site
+        self._host_limits = {
+            host: threading.Semaphore(4)
+            for host in ('stocktwits', 'finviz', 'reddit', 'yahoo')
+        }
+        self._print_lock = threading.Lock()
+        
+        # Process pool for HTML parsing, only set while screen_stocks runs
+        self._parse_pool = None
+        
+        # yfinance caches - prices are batch-downloaded into days x tickers
+        # panels and scored together, Ticker objects are reused
+        self._close = None
+        self._volume = None
+        self._momentum = {}
+        # yf.download keeps module-level state, so never run two at once
+        self._download_lock = threading.Lock()
+    
+    def prefetch(self, tickers):
+        """
+        Download 3 months of prices for many tickers in one batched request
+        and score their momentum in one vectorized pass
+        """
+        import pandas as pd
+        
+        tickers = [t for t in tickers if t not in self._momentum]
+        if self.cache is not None:
+            # Skip tickers whose momentum score is still cached
+            tickers = [t for t in tickers
+                       if self.cache.get('momentum', cache_key(t)) is None]
+        if not tickers:
+            return
+        
+        with self._download_lock:
+            try:
+                with self._host_limits['yahoo']:
+                    data = _yf().download(tickers, period='3mo', group_by='ticker',
+                                       threads=True, progress=False)
+            except Exception as e:
+                return
+            
+            if not isinstance(data.columns, pd.MultiIndex):
+                if len(tickers) != 1:
+                    return
+                # Single ticker without a ticker level
+                data = pd.concat({tickers[0]: data}, axis=1)
+            
+            downloaded = set(data.columns.get_level_values(0))
+            tickers = [t for t in tickers if t in downloaded]
+            if not tickers:
+                return
+            
+            fields = set(data.columns.get_level_values(1))
+            price_col = 'Adj Close' if 'Adj Close' in fields else 'Close'
+            
+            # Days x tickers panels
+            close = pd.DataFrame({t: data[t][price_col] for t in tickers})
+            volume = pd.DataFrame({t: data[t]['Volume'] for t in tickers})
+            if self._close is not None:
+                close = self._close.join(close, how='outer')
+                volume = self._volume.join(volume, how='outer')
+            self._close, self._volume = close, volume
+            
+            self._momentum.update(self.compute_momentum_all())
     
+    def compute_momentum_all(self):
+        """
+        Momentum score for every prefetched ticker, as a Series by ticker
+        """
+        import pandas as pd
+        
+        close, volume = self._close, self._volume
+        if close is None:
+            return pd.Series(dtype=int)
+        if len(close) < 20:
+            return pd.Series(50, index=close.columns)
+        
+        prices = close.ffill()
+        current = prices.iloc[-1]
+        month_ago = prices.iloc[-20]
+        
+        # Calculate return
+        momentum = ((current - month_ago) / month_ago) * 100
+        
+        # Volume analysis
+        avg_vol_recent = volume.tail(10).mean()
+        avg_vol_baseline = volume.head(40).mean()
+        volume_surge = ((avg_vol_recent - avg_vol_baseline) / avg_vol_baseline) * 100
+        volume_surge = volume_surge.where(avg_vol_baseline > 0, 0)
+        
+        # Score based on momentum and volume (NaN counts as no move)
+        momentum = np.nan_to_num(momentum.to_numpy(dtype=float))
+        volume_surge = np.nan_to_num(volume_surge.to_numpy(dtype=float))
+        score = (50
+                 + _MOMENTUM_UP_DELTAS[np.searchsorted(_MOMENTUM_UP_BINS, momentum)]
+                 + _MOMENTUM_DOWN_DELTAS[np.searchsorted(_MOMENTUM_DOWN_BINS, momentum, side='right')]
+                 + _VOLUME_DELTAS[np.searchsorted(_VOLUME_BINS, volume_surge)])
+        
+        scores = pd.Series(np.clip(score, 0, 100), index=close.columns)
+        # Fewer than 20 days of history is treated as neutral
+        return scores.where(close.count() >= 20, 50).astype(int)
+    
+    def _parse(self, parser, content):
+        """
+        Run an HTML parser, in the process pool when screening uses one
+        """
+        if self._parse_pool is None:
+            return parser(content)
+        return self._parse_pool.submit(parser, content).result()
+    
+    @cached('stocktwits', ttl=300, empty=(50, 0, 0, 0))
     def get_stocktwits_sentiment(self, ticker):
         """
         Get StockTwits sentiment (FREE, no API key!)
@@ -41,31 +452,25 @@ class FreeSentimentAnalyzer:
         """
         try:
             url = f"https://api.stocktwits.com/api/2/streams/symbol/{ticker}.json"
-            response = self.session.get(url, timeout=10)
+            with self._host_limits['stocktwits']:
+                response = self.session.get(url, timeout=10)
             
             if response.status_code != 200:
                 return 50, 0, 0, 0
             
-            data = response.json()
+            # StockTwits parse
+            data = orjson.loads(response.content) if orjson else response.json()
             
             if 'messages' not in data:
                 return 50, 0, 0, 0
             
             messages = data['messages']
             
-            bullish = 0
-            bearish = 0
-            total = 0
-            
-            for msg in messages:
-                total += 1
-                if 'entities' in msg and 'sentiment' in msg['entities']:
-                    sentiment = msg['entities']['sentiment']
-                    if sentiment:
-                        if sentiment.get('basic') == 'Bullish':
-                            bullish += 1
-                        elif sentiment.get('basic') == 'Bearish':
-                            bearish += 1
+            labels = [((msg.get('entities') or {}).get('sentiment') or {}).get('basic')
+                      for msg in messages]
+            bullish = labels.count('Bullish')
+            bearish = labels.count('Bearish')
+            total = len(messages)
             
             if bullish + bearish == 0:
                 sentiment_score = 50
@@ -77,92 +482,70 @@ class FreeSentimentAnalyzer:
         except Exception as e:
             return 50, 0, 0, 0
     
+    @cached('yahoo_news', ttl=900, empty=(50, 0))
     def get_yahoo_news_sentiment(self, ticker):
         """
         Scrape Yahoo Finance news for sentiment
         """
         try:
-            stock = yf.Ticker(ticker)
-            news = stock.news
+            stock = _get_ticker(ticker)
+            with self._host_limits['yahoo']:
+                news = stock.news
             
             if not news:
                 return 50, 0
             
-            positive_words = ['surge', 'soar', 'rally', 'gain', 'beat', 'growth', 
-                            'record', 'strong', 'bullish', 'upgrade', 'outperform',
-                            'buy', 'positive', 'breakthrough', 'success']
-            negative_words = ['drop', 'fall', 'plunge', 'loss', 'miss', 'weak', 
-                            'decline', 'bearish', 'downgrade', 'concern', 'warning',
-                            'sell', 'negative', 'disappointing', 'trouble']
-            
-            sentiment_scores = []
-            
-            for article in news[:20]:  # Last 20 articles
-                title = article.get('title', '').lower()
-                
-                pos_count = sum(1 for word in positive_words if word in title)
-                neg_count = sum(1 for word in negative_words if word in title)
-                
-                if pos_count > neg_count:
-                    sentiment_scores.append(75)
-                elif neg_count > pos_count:
-                    sentiment_scores.append(25)
-                else:
-                    sentiment_scores.append(50)
-            
-            avg_sentiment = np.mean(sentiment_scores) if sentiment_scores else 50
+            titles = [article.get('title', '').lower() for article in news[:20]]  # Last 20 articles
+            avg_sentiment = _score_headlines(titles, _YAHOO_POS_RE, _YAHOO_NEG_RE)
             
             return avg_sentiment, len(news)
             
         except Exception as e:
             return 50, 0
     
+    @cached('finviz', ttl=900, empty=(50, 0))
     def get_finviz_sentiment(self, ticker):
         """
         Get sentiment from Finviz (free stock screener)
+        Expired pages are revalidated with ETag/Last-Modified
         """
         try:
             url = f"https://finviz.com/quote.ashx?t={ticker}"
-            response = self.session.get(url, timeout=10)
             
-            if response.status_code != 200:
-                return 50, 0
+            # Conditional request if we still hold an (expired) parse
+            stale = None
+            headers = {}
+            if self.cache is not None:
+                stale = self.cache.load('finviz', cache_key(ticker))
+                if stale:
+                    headers = self.cache.get('finviz_validators', ticker, {})
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            with self._host_limits['finviz']:
+                response = self.session.get(url, headers=headers, timeout=10)
             
-            # Look for news headlines
-            news_table = soup.find('table', {'id': 'news-table'})
+            if response.status_code == 304 and stale:
+                # Page unchanged - skip parsing entirely
+                return tuple(stale['data'])
             
-            if not news_table:
+            if response.status_code != 200:
                 return 50, 0
             
-            headlines = news_table.find_all('a')
+            if self.cache is not None:
+                validators = {}
+                if response.headers.get('ETag'):
+                    validators['If-None-Match'] = response.headers['ETag']
+                if response.headers.get('Last-Modified'):
+                    validators['If-Modified-Since'] = response.headers['Last-Modified']
+                if validators:
+                    self.cache.set('finviz_validators', ticker, validators, ttl=7 * 86400)
             
-            positive_words = ['surge', 'rally', 'gain', 'upgrade', 'buy', 'bullish']
-            negative_words = ['drop', 'fall', 'downgrade', 'sell', 'bearish', 'concern']
-            
-            sentiment_scores = []
-            
-            for headline in headlines[:15]:
-                text = headline.text.lower()
-                
-                pos = sum(1 for word in positive_words if word in text)
-                neg = sum(1 for word in negative_words if word in text)
-                
-                if pos > neg:
-                    sentiment_scores.append(75)
-                elif neg > pos:
-                    sentiment_scores.append(25)
-                else:
-                    sentiment_scores.append(50)
-            
-            avg_sentiment = np.mean(sentiment_scores) if sentiment_scores else 50
-            
-            return avg_sentiment, len(headlines)
+            # Score the news headlines
+            return self._parse(parse_finviz, response.content)
             
         except Exception as e:
             return 50, 0
     
+    @cached('reddit', ttl=600, empty=(0, 0, 0))
     def get_reddit_mentions_scrape(self, ticker):
         """
         Scrape Reddit for mentions (no API needed)
@@ -171,73 +554,66 @@ class FreeSentimentAnalyzer:
         try:
             # Search WallStreetBets
             url = f"https://old.reddit.com/r/wallstreetbets/search/?q={ticker}&restrict_sr=1&sort=new"
-            response = self.session.get(url, timeout=10)
+            with self._host_limits['reddit']:
+                response = self.session.get(url, timeout=10)
             
             if response.status_code != 200:
                 return 0, 0, 0
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Count posts
-            posts = soup.find_all('div', class_='search-result')
-            
-            bullish_keywords = ['buy', 'calls', 'moon', 'yolo', 'bullish', 'long']
-            bearish_keywords = ['sell', 'puts', 'bearish', 'short', 'crash']
-            
-            bullish_count = 0
-            bearish_count = 0
-            
-            for post in posts[:20]:
-                title = post.text.lower()
-                
-                if any(word in title for word in bullish_keywords):
-                    bullish_count += 1
-                elif any(word in title for word in bearish_keywords):
-                    bearish_count += 1
-            
-            total_mentions = len(posts)
-            
-            return total_mentions, bullish_count, bearish_count
+            # Count and classify posts
+            return self._parse(parse_reddit, response.content)
             
         except Exception as e:
             return 0, 0, 0
     
+    @cached('price', ttl=60, empty=None)
+    def _get_current_price(self, ticker):
+        """
+        Latest price from fast_info (one quote request, not the full .info)
+        """
+        try:
+            with self._host_limits['yahoo']:
+                return float(_get_ticker(ticker).fast_info.last_price)
+        except Exception:
+            return None
+    
+    @cached('analyst', ttl=6 * 3600, empty={})
+    def _get_analyst_info(self, ticker):
+        """
+        The analyst fields of yfinance .info (the rest of the dict is dropped)
+        """
+        try:
+            with self._host_limits['yahoo']:
+                info = _get_ticker(ticker).info
+        except Exception:
+            return {}
+        
+        keys = ('recommendationKey', 'targetMeanPrice', 'currentPrice',
+                'numberOfAnalystOpinions')
+        return {key: info[key] for key in keys if info.get(key) is not None}
+    
     def get_analyst_ratings(self, ticker):
         """
         Get analyst recommendations from yfinance
         """
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            info = self._get_analyst_info(ticker)
             
             recommendation = info.get('recommendationKey', 'none')
             
-            rec_scores = {
-                'strong_buy': 95,
-                'buy': 80,
-                'outperform': 80,
-                'hold': 50,
-                'underperform': 20,
-                'sell': 10,
-                'strong_sell': 5,
-                'none': 50
-            }
-            
-            score = rec_scores.get(recommendation, 50)
+            score = _REC_SCORES.get(recommendation, 50)
             
             # Get target upside
             target = info.get('targetMeanPrice', None)
-            current = info.get('currentPrice', None)
+            current = self._get_current_price(ticker) or info.get('currentPrice')
             
             upside = 0
             if target and current and current > 0:
                 upside = ((target - current) / current) * 100
                 
                 # Boost score for big upside
-                if upside > 25:
-                    score = min(score + 15, 100)
-                elif upside > 15:
-                    score = min(score + 10, 100)
+                boost = _UPSIDE_BOOSTS[np.searchsorted(_UPSIDE_BINS, upside)]
+                score = min(score + int(boost), 100)
             
             num_analysts = info.get('numberOfAnalystOpinions', 0)
             
@@ -246,162 +622,154 @@ class FreeSentimentAnalyzer:
         except Exception as e:
             return 50, 'none', 0, 0
     
+    @cached('momentum', ttl=86400, empty=50)
     def get_price_momentum(self, ticker):
         """
         Get price momentum (institutional buying signal)
+        Scores come from the batched panel built by prefetch()
         """
         try:
-            data = yf.download(ticker, period='3mo', progress=False)
-            
-            if len(data) < 20:
-                return 50
-            
-            # Handle MultiIndex
-            if isinstance(data.columns, pd.MultiIndex):
-                data = data.xs(ticker, level=1, axis=1)
-            
-            price_col = 'Adj Close' if 'Adj Close' in data.columns else 'Close'
-            
-            current = data[price_col].iloc[-1]
-            month_ago = data[price_col].iloc[-20]
-            
-            # Calculate return
-            momentum = ((current - month_ago) / month_ago) * 100
-            
-            # Volume analysis
-            avg_vol_recent = data['Volume'].tail(10).mean()
-            avg_vol_baseline = data['Volume'].head(40).mean()
-            
-            volume_surge = 0
-            if avg_vol_baseline > 0:
-                volume_surge = ((avg_vol_recent - avg_vol_baseline) / avg_vol_baseline) * 100
-            
-            # Score based on momentum and volume
-            score = 50
-            
-            if momentum > 20:
-                score += 25
-            elif momentum > 10:
-                score += 15
-            elif momentum > 5:
-                score += 5
-            elif momentum < -20:
-                score -= 25
-            elif momentum < -10:
-                score -= 15
-            
-            if volume_surge > 50:
-                score += 10
-            elif volume_surge > 25:
-                score += 5
-            
-            return max(0, min(100, score))
+            if ticker not in self._momentum:
+                self.prefetch([ticker])
+            return int(self._momentum.get(ticker, 50))
             
         except Exception as e:
             return 50
     
+    def _collect_signals(self, ticker):
+        """
+        Fetch every source for one ticker
+        Returns the raw values in _FIELDS order (scoring is done by score_batch)
+        """
+        # Independent hosts, so fetch them side by side
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            st_future = executor.submit(self.get_stocktwits_sentiment, ticker)
+            news_future = executor.submit(self.get_yahoo_news_sentiment, ticker)
+            finviz_future = executor.submit(self.get_finviz_sentiment, ticker)
+            reddit_future = executor.submit(self.get_reddit_mentions_scrape, ticker)
+            analyst_future = executor.submit(self.get_analyst_ratings, ticker)
+            momentum_future = executor.submit(self.get_price_momentum, ticker)
+            
+            st_score, st_total, st_bull, st_bear = st_future.result()
+            news_score, news_count = news_future.result()
+            finviz_score, finviz_count = finviz_future.result()
+            reddit_mentions, reddit_bull, reddit_bear = reddit_future.result()
+            analyst_score, recommendation, upside, num_analysts = analyst_future.result()
+            momentum_score = momentum_future.result()
+        
+        # Total buzz
+        total_buzz = st_total + news_count + finviz_count + reddit_mentions
+        
+        return (ticker, st_score, st_bull, st_bear, st_total,
+                analyst_score, recommendation, upside, num_analysts,
+                momentum_score, news_score, news_count, finviz_score,
+                reddit_mentions, reddit_bull, reddit_bear, total_buzz)
+    
+    def _print_score(self, ticker, composite, signal, total_buzz, st_bull, st_bear):
+        with self._print_lock:
+            print(f"  [{ticker}] Score: {composite:.1f} | {signal} | Buzz: {total_buzz} | ST: {st_bull}B/{st_bear}B")
+    
     def calculate_composite_score(self, ticker):
         """
         Calculate final composite sentiment score
         """
-        print(f"  [{ticker}] ", end='', flush=True)
-        
         try:
-            # Get all signals
-            st_score, st_total, st_bull, st_bear = self.get_stocktwits_sentiment(ticker)
-            news_score, news_count = self.get_yahoo_news_sentiment(ticker)
-            finviz_score, finviz_count = self.get_finviz_sentiment(ticker)
-            reddit_mentions, reddit_bull, reddit_bear = self.get_reddit_mentions_scrape(ticker)
-            analyst_score, recommendation, upside, num_analysts = self.get_analyst_ratings(ticker)
-            momentum_score = self.get_price_momentum(ticker)
-            
-            # Calculate Reddit sentiment
-            reddit_score = 50
-            if reddit_bull + reddit_bear > 0:
-                reddit_score = (reddit_bull / (reddit_bull + reddit_bear)) * 100
-            
-            # Total buzz
-            total_buzz = st_total + news_count + finviz_count + reddit_mentions
-            
-            # Weighted composite
-            weights = {
-                'stocktwits': 0.30,    # Best free source
-                'analyst': 0.25,       # Professional opinion
-                'momentum': 0.20,      # Price action
-                'news': 0.15,          # News sentiment
-                'finviz': 0.05,        # Additional news
-                'reddit': 0.05         # Social buzz
-            }
-            
-            composite = (
-                weights['stocktwits'] * st_score +
-                weights['analyst'] * analyst_score +
-                weights['momentum'] * momentum_score +
-                weights['news'] * news_score +
-                weights['finviz'] * finviz_score +
-                weights['reddit'] * reddit_score
-            )
-            
-            # Determine signal
-            if composite >= 75 and total_buzz >= 15 and st_bull > st_bear:
-                signal = 'STRONG_BUY'
-            elif composite >= 65:
-                signal = 'BUY'
-            elif composite <= 35:
-                signal = 'SELL'
-            else:
-                signal = 'HOLD'
-            
-            print(f"Score: {composite:.1f} | {signal} | Buzz: {total_buzz} | ST: {st_bull}B/{st_bear}B")
-            
-            return {
-                'ticker': ticker,
-                'composite_score': composite,
-                'signal': signal,
-                'stocktwits_score': st_score,
-                'stocktwits_bullish': st_bull,
-                'stocktwits_bearish': st_bear,
-                'stocktwits_total': st_total,
-                'analyst_score': analyst_score,
-                'analyst_recommendation': recommendation,
-                'target_upside': upside,
-                'num_analysts': num_analysts,
-                'momentum_score': momentum_score,
-                'news_score': news_score,
-                'news_count': news_count,
-                'reddit_mentions': reddit_mentions,
-                'reddit_bullish': reddit_bull,
-                'reddit_bearish': reddit_bear,
-                'total_buzz': total_buzz
-            }
+            values = self._collect_signals(ticker)
+            
+            # Same scoring as a screen, as a batch of one
+            fields = {field: np.array([value], dtype=dtype)
+                      for (field, dtype), value in zip(_FIELDS.items(), values)}
+            composite, signal = score_batch(fields)
+            
+            result = dict(zip(_FIELDS, values))
+            result['composite_score'] = float(composite[0])
+            result['signal'] = signal[0]
+            
+            self._print_score(ticker, result['composite_score'], result['signal'],
+                              result['total_buzz'], result['stocktwits_bullish'],
+                              result['stocktwits_bearish'])
+            
+            return {column: result[column] for column in _RESULT_COLUMNS}
             
         except Exception as e:
-            print(f"Error: {e}")
+            with self._print_lock:
+                print(f"  [{ticker}] Error: {e}")
             return None
     
-    def screen_stocks(self, stock_list, top_n=15):
+    def save_results(self, df, as_csv=False):
+        """
+        Save full results as zstd Parquet, or CSV if asked (or pyarrow is missing)
+        Returns the file name written
+        """
+        if not as_csv:
+            try:
+                df.to_parquet('free_sentiment_analysis.parquet', engine='pyarrow',
+                              compression='zstd', index=False)
+                return 'free_sentiment_analysis.parquet'
+            except ImportError:
+                pass  # pyarrow not installed
+        
+        df.to_csv('free_sentiment_analysis.csv', index=False)
+        return 'free_sentiment_analysis.csv'
+    
+    def screen_stocks(self, stock_list, top_n=15, max_workers=8, as_csv=False,
+                      parse_workers=0):
         """
         Screen stocks for best opportunities
+        Tickers are scored concurrently; politeness is enforced per host.
+        parse_workers > 0 moves HTML parsing into that many processes
+        (e.g. os.cpu_count()), which pays off for large screens.
         """
+        import pandas as pd
+        
         print(f"\n{'='*80}")
         print(f"FREE SENTIMENT SCREENING: {len(stock_list)} STOCKS")
         print(f"{'='*80}")
         print("Sources: StockTwits + Yahoo News + Finviz + Reddit + Analysts\n")
         
-        results = []
+        self.prefetch(stock_list)
+        
+        # One preallocated array per field; each ticker fills its own slot,
+        # so rows stay in input order and ties rank like a serial run
+        n = len(stock_list)
+        fields = {field: np.empty(n, dtype=dtype) for field, dtype in _FIELDS.items()}
+        collected = np.zeros(n, dtype=bool)
         
-        for i, ticker in enumerate(stock_list, 1):
-            print(f"[{i}/{len(stock_list)}] ", end='')
-            result = self.calculate_composite_score(ticker)
-            if result:
-                results.append(result)
-            time.sleep(1)  # Be polite to servers
+        if parse_workers:
+            self._parse_pool = ProcessPoolExecutor(max_workers=parse_workers)
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(self._collect_signals, ticker): i
+                           for i, ticker in enumerate(stock_list)}
+                for done, future in enumerate(as_completed(futures), 1):
+                    i = futures[future]
+                    try:
+                        for array, value in zip(fields.values(), future.result()):
+                            array[i] = value
+                        collected[i] = True
+                        print(f"  [{stock_list[i]}] fetched ({done}/{n})")
+                    except Exception as e:
+                        print(f"  [{stock_list[i]}] Error: {e}")
+        finally:
+            if self._parse_pool is not None:
+                self._parse_pool.shutdown()
+                self._parse_pool = None
         
-        if not results:
+        if not collected.any():
             print("\n❌ No results obtained")
             return pd.DataFrame(), pd.DataFrame()
         
-        df = pd.DataFrame(results)
+        # Score and classify the whole batch at once
+        fields = {field: array[collected] for field, array in fields.items()}
+        composite, signal = score_batch(fields)
+        
+        print()
+        for row in zip(fields['ticker'], composite, signal, fields['total_buzz'],
+                       fields['stocktwits_bullish'], fields['stocktwits_bearish']):
+            self._print_score(*row)
+        
+        columns = {**fields, 'composite_score': composite, 'signal': signal}
+        df = pd.DataFrame({column: columns[column] for column in _RESULT_COLUMNS})
         df = df.sort_values('composite_score', ascending=False)
         
         buy_signals = df[df['signal'].isin(['STRONG_BUY', 'BUY'])]
@@ -409,22 +777,20 @@ class FreeSentimentAnalyzer:
         print(f"\n{'='*80}")
         print(f"TOP {top_n} OPPORTUNITIES")
         print(f"{'='*80}")
-        print(f"{'#':<4}{'Ticker':<8}{'Signal':<14}{'Score':<8}{'ST Bull':<9}{'Analyst':<10}{'Mom':<8}{'Buzz':<8}{'Upside'}")
-        print(f"{'-'*80}")
-        
-        for idx, (_, row) in enumerate(buy_signals.head(top_n).iterrows(), 1):
-            print(f"{idx:<4}"
-                  f"{row['ticker']:<8}"
-                  f"{row['signal']:<14}"
-                  f"{row['composite_score']:>6.1f}  "
-                  f"{row['stocktwits_bullish']:>7.0f}  "
-                  f"{row['analyst_score']:>8.1f}  "
-                  f"{row['momentum_score']:>6.1f}  "
-                  f"{row['total_buzz']:>6.0f}  "
-                  f"{row['target_upside']:>6.1f}%")
-        
-        print(f"\n💾 Full results saved to 'free_sentiment_analysis.csv'")
-        df.to_csv('free_sentiment_analysis.csv', index=False)
+        # Format the whole table column-wise in one pandas call
+        table = buy_signals.head(top_n)[list(_TABLE_COLUMNS)]
+        if len(table) > 0:
+            table.insert(0, '#', range(1, len(table) + 1))
+            lines = table.to_string(index=False, header=['#', *_TABLE_COLUMNS.values()],
+                                    formatters=_TABLE_FORMATTERS, col_space=8).split('\n')
+            print(lines[0])
+            print(f"{'-'*80}")
+            print('\n'.join(lines[1:]))
+        else:
+            print(f"{'-'*80}")
+        
+        self.results_file = self.save_results(df, as_csv)
+        print(f"\n💾 Full results saved to '{self.results_file}'")
         
         # Show best pick details
         if len(buy_signals) > 0:
@@ -442,22 +808,31 @@ class FreeSentimentAnalyzer:
         return buy_signals.head(top_n), df
 
 
+# Curated universe, built once (read-only so callers can't mutate it)
+_UNIVERSE = MappingProxyType({
+    'Mega-Cap Tech': ('AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META', 'NVDA', 'TSLA'),
+    'Meme Stocks': ('GME', 'AMC', 'BBBY', 'PLTR', 'BB'),
+    'Crypto/Fintech': ('COIN', 'MSTR', 'SQ', 'HOOD', 'SOFI'),
+    'Semiconductors': ('AMD', 'INTC', 'MU', 'AVGO', 'QCOM'),
+    'AI/Cloud': ('SNOW', 'CRWD', 'NET', 'DDOG', 'AI', 'SMCI'),
+    'Popular Growth': ('SHOP', 'ROKU', 'UBER', 'LYFT', 'RIVN'),
+    'Indices': ('SPY', 'QQQ', 'IWM'),
+})
+
+
 def get_stock_universe():
     """
     Get curated stock list (focus on high social media coverage)
     """
-    return {
-        'Mega-Cap Tech': ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META', 'NVDA', 'TSLA'],
-        'Meme Stocks': ['GME', 'AMC', 'BBBY', 'PLTR', 'BB'],
-        'Crypto/Fintech': ['COIN', 'MSTR', 'SQ', 'HOOD', 'SOFI'],
-        'Semiconductors': ['AMD', 'INTC', 'MU', 'AVGO', 'QCOM'],
-        'AI/Cloud': ['SNOW', 'CRWD', 'NET', 'DDOG', 'AI', 'SMCI'],
-        'Popular Growth': ['SHOP', 'ROKU', 'UBER', 'LYFT', 'RIVN'],
-        'Indices': ['SPY', 'QQQ', 'IWM']
-    }
+    return _UNIVERSE
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Free sentiment stock screener")
+    parser.add_argument('--csv', action='store_true',
+                        help="save results as CSV instead of Parquet")
+    args = parser.parse_args()
+    
     print("\n" + "="*80)
     print("FREE SENTIMENT TRADING SYSTEM")
     print("="*80)
@@ -483,11 +858,8 @@ if __name__ == "__main__":
     choice = input("\nEnter choice (1/2/3) or press Enter for #3: ").strip()
     
     if choice == '1':
-        # All stocks
-        all_stocks = []
-        for category, stocks in universe.items():
-            all_stocks.extend(stocks)
-        stocks_to_screen = list(set(all_stocks))
+        # All stocks, deduplicated but kept in category order
+        stocks_to_screen = list(dict.fromkeys(itertools.chain.from_iterable(universe.values())))
         
     elif choice == '2':
         # Pick category
@@ -514,14 +886,14 @@ if __name__ == "__main__":
     print(f"\n🔍 Screening {len(stocks_to_screen)} stocks...")
     print(f"⏱️  Estimated time: ~{len(stocks_to_screen)} minutes\n")
     
-    top_picks, all_results = analyzer.screen_stocks(stocks_to_screen, top_n=15)
+    top_picks, all_results = analyzer.screen_stocks(stocks_to_screen, top_n=15, as_csv=args.csv)
     
     print("\n" + "="*80)
     print("SCREENING COMPLETE!")
     print("="*80)
     print(f"\nFound {len(top_picks)} BUY/STRONG_BUY signals")
     print("\nNext steps:")
-    print("1. Review 'free_sentiment_analysis.csv' for full details")
+    print(f"1. Review '{analyzer.results_file}' for full details")
     print("2. Research the top picks")
     print("3. Check StockTwits.com for each ticker to verify sentiment")
     print("4. Make your trading decisions!")
@@ -16,9 +16,27 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import csv
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
 import time
+from types import MappingProxyType
 import re
 
+from rate_limit import RateLimiter
+try:
+    import orjson  # optional, faster JSON parsing
+except ImportError:
+    orjson = None
+try:
+    import ahocorasick  # optional, pyahocorasick C automaton for keyword scans
+except ImportError:
+    ahocorasick = None
+
 # ============================================================================
 # CONFIGURATION - ADD YOUR API KEYS HERE
 # ============================================================================
@@ -38,6 +56,97 @@ NEWS_API_KEY = "YOUR_API_KEY_HERE"
 
 # ============================================================================
 
+# Keyword sets per source (each word present counts once)
+REDDIT_BULLISH = frozenset({'buy', 'calls', 'moon', 'bullish', 'rocket',
+                            'to the moon', 'yolo', 'long', 'undervalued'})
+REDDIT_BEARISH = frozenset({'sell', 'puts', 'crash', 'bearish', 'dump',
+                            'overvalued', 'short', 'bubble'})
+TWITTER_BULLISH = frozenset({'buy', 'bullish', 'moon', 'calls', 'long', 'breakout'})
+TWITTER_BEARISH = frozenset({'sell', 'bearish', 'puts', 'short', 'crash', 'dump'})
+NEWS_POSITIVE = frozenset({'surge', 'soar', 'rally', 'gain', 'beat', 'growth',
+                           'record', 'strong', 'bullish', 'upgrade', 'outperform'})
+NEWS_NEGATIVE = frozenset({'drop', 'fall', 'plunge', 'loss', 'miss', 'weak',
+                           'decline', 'bearish', 'downgrade', 'concern', 'warning'})
+
+# yfinance .info fields read by the analyzer (fast_info has neither)
+_INFO_KEYS = ('longName', 'recommendationKey')
+
+# Columns of a result row (the CSV header), and the subset kept in memory
+# for ranking and the top-N table
+_RESULT_COLUMNS = (
+    'ticker', 'composite_score', 'signal', 'analyst_score',
+    'reddit_sentiment', 'reddit_mentions', 'reddit_bullish', 'reddit_bearish',
+    'stocktwits_sentiment', 'stocktwits_messages', 'stocktwits_bullish_pct',
+    'twitter_sentiment', 'twitter_count', 'news_sentiment', 'news_count',
+    'total_buzz', 'recommendation',
+)
+_SUMMARY_COLUMNS = (
+    'ticker', 'composite_score', 'signal', 'analyst_score', 'reddit_mentions',
+    'stocktwits_bullish_pct', 'total_buzz', 'recommendation',
+)
+
+# Analyst recommendationKey -> score
+_REC_SCORES = MappingProxyType({
+    'strong_buy': 100, 'buy': 80, 'outperform': 80,
+    'hold': 50, 'underperform': 20, 'sell': 10,
+    'strong_sell': 0, 'none': 50
+})
+
+# Weighted composite, in the order scores are stacked
+_WEIGHTS = np.array([
+    0.25,  # Analyst - professional opinion
+    0.25,  # StockTwits - dedicated stock sentiment
+    0.20,  # Reddit - social buzz
+    0.15,  # News sentiment
+    0.10,  # Twitter buzz
+    0.05,  # Buzz - overall volume
+])
+
+
+class _KeywordMatcher:
+    """
+    Counts how many words of a set appear in a text (substring match,
+    each word counted once). Uses a single Aho-Corasick pass when
+    pyahocorasick is installed, a per-word scan otherwise.
+    """
+    
+    def __init__(self, words):
+        self.words = tuple(words)
+        self._automaton = None
+        
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for i, word in enumerate(self.words):
+                automaton.add_word(word, i)
+            automaton.make_automaton()
+            self._automaton = automaton
+    
+    def count(self, text):
+        """Number of distinct words found in text (already lowercased)"""
+        if self._automaton is None:
+            return sum(1 for word in self.words if word in text)
+        return len({i for _, i in self._automaton.iter(text)})
+
+
+def _score_texts(texts, pos, neg):
+    """
+    Average keyword vote over a batch of lowercased texts: each text is
+    +1 (more positive words), -1 (more negative) or 0
+    """
+    n = len(texts)
+    pos_counts = np.fromiter(map(pos.count, texts), dtype=np.int32, count=n)
+    neg_counts = np.fromiter(map(neg.count, texts), dtype=np.int32, count=n)
+    return np.sign(pos_counts - neg_counts).mean()
+
+
+# Keyword matchers, built once at import
+_REDDIT_BULL = _KeywordMatcher(REDDIT_BULLISH)
+_REDDIT_BEAR = _KeywordMatcher(REDDIT_BEARISH)
+_TWITTER_BULL = _KeywordMatcher(TWITTER_BULLISH)
+_TWITTER_BEAR = _KeywordMatcher(TWITTER_BEARISH)
+_NEWS_POS = _KeywordMatcher(NEWS_POSITIVE)
+_NEWS_NEG = _KeywordMatcher(NEWS_NEGATIVE)
+
 
 class MultiSourceSentimentAnalyzer:
     """
@@ -51,6 +160,31 @@ class MultiSourceSentimentAnalyzer:
         self.use_twitter = use_twitter
         self.use_news = use_news
         
+        # One pooled keep-alive session for StockTwits and NewsAPI, shared by
+        # all screening threads; transient failures are retried with backoff
+        self._http = requests.Session()
+        self._http.headers.update({'User-Agent': 'sentiment-screener/1.0'})
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32,
+                              max_retries=Retry(total=3, backoff_factor=0.3))
+        self._http.mount('https://', adapter)
+        self._http.mount('http://', adapter)
+        
+        # Per-source politeness: requests per second across all threads, and
+        # requests in flight. PRAW is not thread-safe, so Reddit runs one at a time.
+        self._source_limits = {
+            'reddit': RateLimiter(1.0, max_in_flight=1),
+            'stocktwits': RateLimiter(2.0, max_in_flight=4),
+            'twitter': RateLimiter(1.0, max_in_flight=2),
+            'news': RateLimiter(1.0, max_in_flight=2),
+            'yahoo': RateLimiter(4.0, max_in_flight=4),
+        }
+        self._print_lock = threading.Lock()
+        
+        # yfinance .info per ticker, shared by news search and analyst data
+        self._info_cache = {}
+        self._info_locks = {}
+        self._info_lock = threading.Lock()
+        
         # Initialize APIs
         self._init_reddit()
         self._init_twitter()
@@ -121,48 +255,46 @@ class MultiSourceSentimentAnalyzer:
             bearish_posts = 0
             total_score = 0
             
-            # Search in each subreddit
-            for subreddit_name in subreddits:
-                try:
-                    subreddit = self.reddit.subreddit(subreddit_name)
+            # One search across all subreddits (PRAW's 'a+b+c' multireddit)
+            try:
+                with self._source_limits['reddit']:
+                    subreddit = self.reddit.subreddit('+'.join(subreddits))
                     
                     # Search for ticker mentions
                     query = f"${ticker} OR {ticker}"
+                    posts = list(subreddit.search(query, time_filter='week',
+                                                  limit=limit * len(subreddits)))
+            except Exception as e:
+                posts = []
+            
+            # Ticker as a whole word; the boundary also matches after '$', so
+            # this covers the $TICKER cashtag too
+            ticker_re = re.compile(rf'\b{re.escape(ticker.lower())}\b')
+            
+            for post in posts:
+                # Check if ticker is actually mentioned (not just in search);
+                # lowercased once, for both this check and the keywords
+                text_lower = (post.title + " " + post.selftext).lower()
+                
+                if ticker_re.search(text_lower):
+                    total_mentions += 1
                     
-                    for post in subreddit.search(query, time_filter='week', limit=limit):
-                        # Check if ticker is actually mentioned (not just in search)
-                        text = (post.title + " " + post.selftext).upper()
-                        
-                        if f"${ticker}" in text or f" {ticker} " in text:
-                            total_mentions += 1
-                            
-                            # Sentiment from upvotes and keywords
-                            upvote_ratio = post.upvote_ratio
-                            score = post.score
-                            
-                            # Keyword sentiment
-                            bullish_words = ['buy', 'calls', 'moon', 'bullish', 'rocket', 
-                                           'to the moon', 'yolo', 'long', 'undervalued']
-                            bearish_words = ['sell', 'puts', 'crash', 'bearish', 'dump', 
-                                           'overvalued', 'short', 'bubble']
-                            
-                            text_lower = text.lower()
-                            bull_count = sum(1 for word in bullish_words if word in text_lower)
-                            bear_count = sum(1 for word in bearish_words if word in text_lower)
-                            
-                            if bull_count > bear_count and upvote_ratio > 0.7:
-                                bullish_posts += 1
-                                total_score += score * upvote_ratio
-                            elif bear_count > bull_count:
-                                bearish_posts += 1
-                                total_score -= score * upvote_ratio
-                            else:
-                                total_score += (score * upvote_ratio * 0.5)
+                    # Sentiment from upvotes and keywords
+                    upvote_ratio = post.upvote_ratio
+                    score = post.score
                     
-                    time.sleep(0.5)  # Rate limiting
+                    # Keyword sentiment
+                    bull_count = _REDDIT_BULL.count(text_lower)
+                    bear_count = _REDDIT_BEAR.count(text_lower)
                     
-                except Exception as e:
-                    continue
+                    if bull_count > bear_count and upvote_ratio > 0.7:
+                        bullish_posts += 1
+                        total_score += score * upvote_ratio
+                    elif bear_count > bull_count:
+                        bearish_posts += 1
+                        total_score -= score * upvote_ratio
+                    else:
+                        total_score += (score * upvote_ratio * 0.5)
             
             if total_mentions == 0:
                 return 0, 0, 0, 0
@@ -185,33 +317,26 @@ class MultiSourceSentimentAnalyzer:
             return 0, 0, 0
         
         try:
-            import requests
-            
             url = f"https://api.stocktwits.com/api/2/streams/symbol/{ticker}.json"
             
-            response = requests.get(url, timeout=10)
+            with self._source_limits['stocktwits']:
+                response = self._http.get(url, timeout=10)
             
             if response.status_code != 200:
                 return 0, 0, 0
             
-            data = response.json()
+            data = orjson.loads(response.content) if orjson else response.json()
             
             if 'messages' not in data:
                 return 0, 0, 0
             
             messages = data['messages']
             
-            bullish_count = 0
-            bearish_count = 0
-            
-            for msg in messages:
-                if 'entities' in msg and 'sentiment' in msg['entities']:
-                    sentiment = msg['entities']['sentiment']
-                    if sentiment:
-                        if sentiment.get('basic') == 'Bullish':
-                            bullish_count += 1
-                        elif sentiment.get('basic') == 'Bearish':
-                            bearish_count += 1
+            # Tally the Bullish/Bearish labels (sentiment may be missing or null)
+            labels = Counter(((msg.get('entities') or {}).get('sentiment') or {}).get('basic')
+                             for msg in messages)
+            bullish_count = labels['Bullish']
+            bearish_count = labels['Bearish']
             
             total = bullish_count + bearish_count
             
@@ -240,34 +365,19 @@ class MultiSourceSentimentAnalyzer:
             # Search for tweets mentioning ticker
             query = f"${ticker} OR #{ticker} -is:retweet lang:en"
             
-            tweets = self.twitter.search_recent_tweets(
-                query=query,
-                max_results=100,
-                tweet_fields=['created_at', 'public_metrics', 'text']
-            )
+            with self._source_limits['twitter']:
+                tweets = self.twitter.search_recent_tweets(
+                    query=query,
+                    max_results=100,
+                    tweet_fields=['created_at', 'public_metrics', 'text']
+                )
             
             if not tweets.data:
                 return 0, 0
             
-            bullish_keywords = ['buy', 'bullish', 'moon', 'calls', 'long', 'breakout']
-            bearish_keywords = ['sell', 'bearish', 'puts', 'short', 'crash', 'dump']
-            
-            sentiment_scores = []
-            
-            for tweet in tweets.data:
-                text = tweet.text.lower()
-                
-                bull_count = sum(1 for word in bullish_keywords if word in text)
-                bear_count = sum(1 for word in bearish_keywords if word in text)
-                
-                if bull_count > bear_count:
-                    sentiment_scores.append(1)
-                elif bear_count > bull_count:
-                    sentiment_scores.append(-1)
-                else:
-                    sentiment_scores.append(0)
+            texts = [tweet.text.lower() for tweet in tweets.data]
             
-            avg_sentiment = np.mean(sentiment_scores) if sentiment_scores else 0
+            avg_sentiment = _score_texts(texts, _TWITTER_BULL, _TWITTER_BEAR)
             
             return avg_sentiment, len(tweets.data)
             
@@ -284,11 +394,8 @@ class MultiSourceSentimentAnalyzer:
             return 0, 0
         
         try:
-            import requests
-            
             # Get company name for better search
-            stock = yf.Ticker(ticker)
-            company_name = stock.info.get('longName', ticker)
+            company_name = self._ticker_info(ticker).get('longName', ticker)
             
             url = "https://newsapi.org/v2/everything"
             params = {
@@ -300,39 +407,23 @@ class MultiSourceSentimentAnalyzer:
                 'from': (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            with self._source_limits['news']:
+                response = self._http.get(url, params=params, timeout=10)
             
             if response.status_code != 200:
                 return 0, 0
             
-            data = response.json()
+            data = orjson.loads(response.content) if orjson else response.json()
             articles = data.get('articles', [])
             
             if not articles:
                 return 0, 0
             
-            positive_words = ['surge', 'soar', 'rally', 'gain', 'beat', 'growth', 
-                            'record', 'strong', 'bullish', 'upgrade', 'outperform']
-            negative_words = ['drop', 'fall', 'plunge', 'loss', 'miss', 'weak', 
-                            'decline', 'bearish', 'downgrade', 'concern', 'warning']
-            
-            sentiment_scores = []
-            
-            for article in articles:
-                title = (article.get('title', '') + ' ' + 
-                        article.get('description', '')).lower()
-                
-                pos_count = sum(1 for word in positive_words if word in title)
-                neg_count = sum(1 for word in negative_words if word in title)
-                
-                if pos_count > neg_count:
-                    sentiment_scores.append(1)
-                elif neg_count > pos_count:
-                    sentiment_scores.append(-1)
-                else:
-                    sentiment_scores.append(0)
+            titles = [(article.get('title', '') + ' ' + 
+                       article.get('description', '')).lower()
+                      for article in articles]
             
-            avg_sentiment = np.mean(sentiment_scores) if sentiment_scores else 0
+            avg_sentiment = _score_texts(titles, _NEWS_POS, _NEWS_NEG)
             
             return avg_sentiment, len(articles)
             
@@ -340,30 +431,54 @@ class MultiSourceSentimentAnalyzer:
             print(f"    News error: {e}")
             return 0, 0
     
+    def _ticker_info(self, ticker):
+        """
+        The .info fields this analyzer uses (longName, recommendationKey),
+        fetched at most once per ticker
+        """
+        # One lock per ticker, so concurrent callers wait for a single fetch
+        with self._info_lock:
+            lock = self._info_locks.setdefault(ticker, threading.Lock())
+        
+        with lock:
+            if ticker not in self._info_cache:
+                stock = yf.Ticker(ticker)
+                with self._source_limits['yahoo']:
+                    info = stock.info
+                # Keep only what is read, not the whole quoteSummary blob
+                self._info_cache[ticker] = {key: info[key] for key in _INFO_KEYS
+                                            if key in info}
+            return self._info_cache[ticker]
+    
     def calculate_composite_sentiment(self, ticker):
         """
         Combine all sentiment sources
         """
-        print(f"  Analyzing {ticker}...", end='', flush=True)
-        
         try:
-            # Get all sentiment sources
-            reddit_sent, reddit_mentions, reddit_bull, reddit_bear = self.get_reddit_sentiment(ticker)
-            st_sent, st_messages, st_bullish_pct = self.get_stocktwits_sentiment(ticker)
-            twitter_sent, twitter_count = self.get_twitter_sentiment(ticker)
-            news_sent, news_count = self.get_news_sentiment(ticker)
-            
-            # Get analyst data from yfinance
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            # Get all sentiment sources plus analyst data from yfinance -
+            # independent APIs, so fetch them side by side. Disabled or
+            # unconfigured sources are not submitted at all.
+            news_enabled = self.use_news and NEWS_API_KEY != "YOUR_API_KEY_HERE"
+            
+            with ThreadPoolExecutor(max_workers=5) as executor:
+                reddit_future = executor.submit(self.get_reddit_sentiment, ticker) if self.reddit else None
+                st_future = executor.submit(self.get_stocktwits_sentiment, ticker) if self.use_stocktwits else None
+                twitter_future = executor.submit(self.get_twitter_sentiment, ticker) if self.twitter else None
+                news_future = executor.submit(self.get_news_sentiment, ticker) if news_enabled else None
+                info_future = executor.submit(self._ticker_info, ticker)
+                
+                reddit_sent, reddit_mentions, reddit_bull, reddit_bear = (
+                    reddit_future.result() if reddit_future else (0, 0, 0, 0))
+                st_sent, st_messages, st_bullish_pct = (
+                    st_future.result() if st_future else (0, 0, 0))
+                twitter_sent, twitter_count = (
+                    twitter_future.result() if twitter_future else (0, 0))
+                news_sent, news_count = (
+                    news_future.result() if news_future else (0, 0))
+                info = info_future.result()
             
             recommendation = info.get('recommendationKey', 'none')
-            rec_scores = {
-                'strong_buy': 100, 'buy': 80, 'outperform': 80,
-                'hold': 50, 'underperform': 20, 'sell': 10,
-                'strong_sell': 0, 'none': 50
-            }
-            analyst_score = rec_scores.get(recommendation, 50)
+            analyst_score = _REC_SCORES.get(recommendation, 50)
             
             # Calculate buzz score (how much people are talking about it)
             total_buzz = reddit_mentions + st_messages + twitter_count + news_count
@@ -371,16 +486,6 @@ class MultiSourceSentimentAnalyzer:
             # Normalize buzz (0-100)
             buzz_score = min(100, (total_buzz / 5) * 10)  # 50+ mentions = 100 score
             
-            # Weight the sources
-            weights = {
-                'analyst': 0.25,      # Professional opinion
-                'stocktwits': 0.25,   # Dedicated stock sentiment
-                'reddit': 0.20,       # Social buzz
-                'news': 0.15,         # News sentiment
-                'twitter': 0.10,      # Twitter buzz
-                'buzz': 0.05          # Overall volume
-            }
-            
             # Convert sentiments (-1 to 1) to scores (0 to 100)
             reddit_score = (reddit_sent + 1) * 50
             st_score = (st_sent + 1) * 50
@@ -388,14 +493,9 @@ class MultiSourceSentimentAnalyzer:
             news_score = (news_sent + 1) * 50
             
             # Calculate composite
-            composite = (
-                weights['analyst'] * analyst_score +
-                weights['stocktwits'] * st_score +
-                weights['reddit'] * reddit_score +
-                weights['news'] * news_score +
-                weights['twitter'] * twitter_score +
-                weights['buzz'] * buzz_score
-            )
+            scores = np.array([analyst_score, st_score, reddit_score,
+                               news_score, twitter_score, buzz_score])
+            composite = float(_WEIGHTS @ scores)
             
             # Determine signal
             if composite >= 75 and total_buzz >= 20:
@@ -407,7 +507,8 @@ class MultiSourceSentimentAnalyzer:
             else:
                 signal = 'HOLD'
             
-            print(f" ✓ Score: {composite:.1f} | {signal} | Buzz: {total_buzz}")
+            with self._print_lock:
+                print(f"  [{ticker}] ✓ Score: {composite:.1f} | {signal} | Buzz: {total_buzz}")
             
             return {
                 'ticker': ticker,
@@ -430,30 +531,47 @@ class MultiSourceSentimentAnalyzer:
             }
             
         except Exception as e:
-            print(f" ✗ Error: {e}")
+            with self._print_lock:
+                print(f"  [{ticker}] ✗ Error: {e}")
             return None
     
-    def screen_stocks(self, stock_list, top_n=15):
+    def screen_stocks(self, stock_list, top_n=15, max_workers=8):
         """
         Screen stocks and return top opportunities
+        Tickers are analyzed concurrently; politeness is enforced per source.
+        Full rows are streamed to multi_source_sentiment.csv as they finish;
+        the returned frames hold the _SUMMARY_COLUMNS only.
         """
         print(f"\n{'='*80}")
         print(f"MULTI-SOURCE SENTIMENT SCREENING: {len(stock_list)} STOCKS")
         print(f"{'='*80}\n")
         
-        results = []
+        # Thin summary records in input order, so ties rank like a serial run
+        scored = [None] * len(stock_list)
+        
+        with open('multi_source_sentiment.csv', 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=_RESULT_COLUMNS)
+            writer.writeheader()
+            
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(self.calculate_composite_sentiment, ticker): i
+                           for i, ticker in enumerate(stock_list)}
+                for future in as_completed(futures):
+                    result = future.result()
+                    if result:
+                        writer.writerow(result)
+                        scored[futures[future]] = {column: result[column]
+                                                   for column in _SUMMARY_COLUMNS}
         
-        for i, ticker in enumerate(stock_list, 1):
-            print(f"[{i}/{len(stock_list)}] ", end='')
-            result = self.calculate_composite_sentiment(ticker)
-            if result:
-                results.append(result)
-            time.sleep(1)  # Rate limiting
+        results = [record for record in scored if record]
         
         if not results:
             return pd.DataFrame(), pd.DataFrame()
         
-        df = pd.DataFrame(results)
+        df = pd.DataFrame.from_records(results)
+        # Few distinct labels, so store them as category codes
+        df['signal'] = df['signal'].astype('category')
+        df['recommendation'] = df['recommendation'].astype('category')
         df = df.sort_values('composite_score', ascending=False)
         
         buy_signals = df[df['signal'].isin(['STRONG_BUY', 'BUY'])]
@@ -474,7 +592,6 @@ class MultiSourceSentimentAnalyzer:
                   f"{row['stocktwits_bullish_pct']:>10.1f}%  "
                   f"{row['total_buzz']:>4.0f}")
         
-        df.to_csv('multi_source_sentiment.csv', index=False)
         print(f"\n💾 Results saved to 'multi_source_sentiment.csv'")
         
         return buy_signals.head(top_n), df
@@ -585,7 +702,7 @@ if __name__ == "__main__":
     ]
     
     print(f"\nScreening {len(popular_stocks)} popular stocks...")
-    print("This takes ~2-3 minutes with rate limiting...\n")
+    print("This takes ~1-2 minutes (Reddit searches stay rate limited)...\n")
     
     top_picks, all_data = analyzer.screen_stocks(popular_stocks, top_n=10)
     
@@ -0,0 +1,38 @@
+"""
+RATE LIMITER FOR SCRAPED ENDPOINTS
+Shared by the sentiment scripts so every source is paced the same way
+"""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Spaces request starts at least 1/rate_per_sec apart across all threads
+    and caps how many are in flight. Use as `with limiter:` around a call.
+    """
+
+    def __init__(self, rate_per_sec, max_in_flight=1):
+        self._interval = 1.0 / rate_per_sec
+        self._next = 0.0
+        self._lock = threading.Lock()
+        self._slots = threading.Semaphore(max_in_flight)
+
+    def acquire(self):
+        self._slots.acquire()
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._next - now)
+            self._next = max(now, self._next) + self._interval
+        # Our start time is reserved, so sleep without holding the lock
+        time.sleep(wait)
+
+    def release(self):
+        self._slots.release()
+
+    def __enter__(self):
+        self.acquire()
+
+    def __exit__(self, *exc_info):
+        self.release()
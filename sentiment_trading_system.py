@@ -6,10 +6,156 @@ Uses real social media, news sentiment, and analyst ratings
 import yfinance as yf
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import functools
+import threading
 import time
+from types import MappingProxyType
+
+from file_cache import FileCache, cached
+from rate_limit import RateLimiter
+try:
+    import orjson  # optional, faster JSON parsing
+except ImportError:
+    orjson = None
+try:
+    import ahocorasick  # optional, pyahocorasick C automaton for keyword scans
+except ImportError:
+    ahocorasick = None
+try:
+    from numba import njit  # optional, compiles the backtest kernel
+except ImportError:
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+
+class _KeywordMatcher:
+    """
+    Finds words of a set in a text (substring match). Uses a single
+    Aho-Corasick pass when pyahocorasick is installed, a per-word scan
+    otherwise.
+    """
+    
+    def __init__(self, words):
+        self.words = tuple(words)
+        self._automaton = None
+        
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for i, word in enumerate(self.words):
+                automaton.add_word(word, i)
+            automaton.make_automaton()
+            self._automaton = automaton
+    
+    def count(self, text):
+        """Number of distinct words found in text (already lowercased)"""
+        if self._automaton is None:
+            return sum(1 for word in self.words if word in text)
+        return len({i for _, i in self._automaton.iter(text)})
+    
+    def contains(self, text):
+        """True if any word occurs in text (already lowercased)"""
+        if self._automaton is None:
+            return any(word in text for word in self.words)
+        return next(self._automaton.iter(text), None) is not None
+
+
+# Title keywords, matched as substrings of the lowercased title
+_REDDIT_BULLISH = _KeywordMatcher(('buy', 'calls', 'moon', 'bullish', 'rocket'))
+_REDDIT_BEARISH = _KeywordMatcher(('sell', 'puts', 'crash', 'bearish', 'dump'))
+_NEWS_POSITIVE = _KeywordMatcher(('surge', 'soar', 'rally', 'gain', 'beat', 'growth', 'record', 'strong', 'bullish'))
+_NEWS_NEGATIVE = _KeywordMatcher(('drop', 'fall', 'plunge', 'loss', 'miss', 'weak', 'decline', 'bearish', 'concern'))
+
+# Analyst grade scoring system
+_GRADE_SCORES = MappingProxyType({
+    'Strong Buy': 100,
+    'Buy': 75,
+    'Outperform': 75,
+    'Overweight': 75,
+    'Hold': 50,
+    'Neutral': 50,
+    'Underperform': 25,
+    'Sell': 0,
+    'Strong Sell': 0
+})
+
+# Yahoo pacing is shared process-wide (the cached helpers below use it)
+_YAHOO_LIMIT = RateLimiter(4.0, max_in_flight=8)
+
+
+def _hour_bucket():
+    """Cache-key component that changes once an hour (a 1 h TTL)"""
+    return int(time.time() // 3600)
+
+
+@functools.lru_cache(maxsize=512)
+def _cached_ticker(ticker):
+    """One yf.Ticker per symbol"""
+    return yf.Ticker(ticker)
+
+
+@functools.lru_cache(maxsize=512)
+def _cached_recommendations(ticker, bucket):
+    """Analyst recommendations, fetched at most once per ticker per bucket"""
+    with _YAHOO_LIMIT:
+        return _cached_ticker(ticker).recommendations
+
+
+@functools.lru_cache(maxsize=512)
+def _cached_news(ticker, bucket):
+    """News items, fetched at most once per ticker per bucket"""
+    with _YAHOO_LIMIT:
+        return _cached_ticker(ticker).news
+
+
+# Backtest signal codes; anything else (HOLD) is 0
+_SIGNAL_CODES = MappingProxyType({'STRONG_BUY': 1, 'BUY': 1, 'SELL': -1})
+
+
+@njit(cache=True)
+def _run_backtest(prices, signals, initial_cash):
+    """
+    Buy/sell state machine over daily prices and int8 signals
+    (1 = buy, -1 = sell, 0 = hold). All-in buys, full exits.
+    Returns per-day cash and shares, plus entry/exit positions and share
+    counts per trade (exit is -1 if still open at the end).
+    """
+    n = len(prices)
+    cash_curve = np.empty(n)
+    shares_curve = np.zeros(n, dtype=np.int64)
+    entry_idx = np.empty(n, dtype=np.int64)
+    exit_idx = np.full(n, -1, dtype=np.int64)
+    trade_shares = np.empty(n, dtype=np.int64)
+    
+    cash = initial_cash
+    shares = 0
+    n_trades = 0
+    
+    for i in range(n):
+        if signals[i] == 1 and shares == 0:
+            buy = int(cash / prices[i])
+            if buy > 0:
+                shares = buy
+                cash -= shares * prices[i]
+                entry_idx[n_trades] = i
+                trade_shares[n_trades] = shares
+                n_trades += 1
+        elif signals[i] == -1 and shares > 0:
+            cash += shares * prices[i]
+            exit_idx[n_trades - 1] = i
+            shares = 0
+        
+        cash_curve[i] = cash
+        shares_curve[i] = shares
+    
+    return (cash_curve, shares_curve, entry_idx[:n_trades],
+            exit_idx[:n_trades], trade_shares[:n_trades])
+
 
 class SentimentTradingSystem:
     """
@@ -20,15 +166,38 @@ class SentimentTradingSystem:
     4. Social media buzz metrics
     """
     
-    def __init__(self, initial_capital=100000):
+    def __init__(self, initial_capital=100000, max_workers=16, cache_dir='.cache'):
         self.initial_capital = initial_capital
         self.cash = initial_capital
         self.portfolio = {}
         self.trades = []
+        self.max_workers = max_workers  # screening threads
+        # Disk cache so reruns within the hour skip the network (None disables)
+        self.cache = FileCache(cache_dir) if cache_dir else None
         
         # Free API sources (no key required)
         self.reddit_base = "https://api.pushshift.io/reddit/search/submission"
         
+        # One keep-alive session for all screening threads, so repeated
+        # pushshift calls reuse connections instead of new TLS handshakes
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64,
+                              max_retries=Retry(total=2, backoff_factor=0.3))
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        
+        # Per-host politeness shared by all screening threads: pushshift
+        # allows ~60 requests/minute, Yahoo is paced more loosely
+        self._host_limits = {
+            'pushshift': RateLimiter(1.0, max_in_flight=2),
+            'yahoo': _YAHOO_LIMIT,
+        }
+        self._print_lock = threading.Lock()
+        
+        # Price frames from prefetch_prices(), keyed by (ticker, start, end)
+        self._price_cache = {}
+    
+    @cached('trading_reddit', ttl=3600, empty=(0, 0))
     def get_reddit_sentiment(self, ticker, days=7):
         """
         Get Reddit sentiment from WallStreetBets and stocks subreddits
@@ -44,29 +213,27 @@ class SentimentTradingSystem:
             positive_mentions = 0
             negative_mentions = 0
             
-            for subreddit in subreddits:
-                url = f"{self.reddit_base}?subreddit={subreddit}&q=${ticker}&after={start_time}&before={end_time}&size=100"
-                
-                try:
-                    response = requests.get(url, timeout=5)
-                    if response.status_code == 200:
-                        data = response.json()
-                        posts = data.get('data', [])
-                        
-                        for post in posts:
-                            total_mentions += 1
-                            title = post.get('title', '').lower()
-                            score = post.get('score', 0)
-                            
-                            # Simple sentiment from upvotes and keywords
-                            if score > 50:  # Popular post
-                                if any(word in title for word in ['buy', 'calls', 'moon', 'bullish', 'rocket']):
-                                    positive_mentions += 1
-                                elif any(word in title for word in ['sell', 'puts', 'crash', 'bearish', 'dump']):
-                                    negative_mentions += 1
+            # One request for all subreddits (pushshift takes a comma list)
+            url = (f"{self.reddit_base}?subreddit={','.join(subreddits)}&q=${ticker}"
+                   f"&after={start_time}&before={end_time}&size={100 * len(subreddits)}")
+            
+            with self._host_limits['pushshift']:
+                response = self._session.get(url, timeout=5)
+            
+            if response.status_code == 200:
+                data = orjson.loads(response.content) if orjson else response.json()
+                posts = data.get('data', [])
+                total_mentions = len(posts)
                 
-                except:
-                    continue
+                for post in posts:
+                    # Simple sentiment from upvotes and keywords; only
+                    # popular posts are classified
+                    if post.get('score', 0) > 50:
+                        title = post.get('title', '').lower()
+                        if _REDDIT_BULLISH.contains(title):
+                            positive_mentions += 1
+                        elif _REDDIT_BEARISH.contains(title):
+                            negative_mentions += 1
             
             if total_mentions == 0:
                 return 0, 0
@@ -78,14 +245,14 @@ class SentimentTradingSystem:
             print(f"  Reddit error for {ticker}: {e}")
             return 0, 0
     
+    @cached('trading_analyst', ttl=3600, empty=50)
     def get_analyst_ratings(self, ticker):
         """
         Get analyst recommendations from yfinance
         Returns: Strong Buy score (0-100)
         """
         try:
-            stock = yf.Ticker(ticker)
-            recommendations = stock.recommendations
+            recommendations = _cached_recommendations(ticker, _hour_bucket())
             
             if recommendations is None or len(recommendations) == 0:
                 return 50  # Neutral
@@ -93,62 +260,37 @@ class SentimentTradingSystem:
             # Get last 3 months of ratings
             recent = recommendations.tail(12)  # Last 12 ratings
             
-            # Count recommendations
-            counts = recent['To Grade'].value_counts()
-            
-            # Scoring system
-            scores = {
-                'Strong Buy': 100,
-                'Buy': 75,
-                'Outperform': 75,
-                'Overweight': 75,
-                'Hold': 50,
-                'Neutral': 50,
-                'Underperform': 25,
-                'Sell': 0,
-                'Strong Sell': 0
-            }
-            
-            total_score = 0
-            total_ratings = 0
-            
-            for grade, count in counts.items():
-                score = scores.get(grade, 50)
-                total_score += score * count
-                total_ratings += count
-            
-            if total_ratings == 0:
+            # Missing grades are skipped; unknown grades count as neutral
+            grades = recent['To Grade'].dropna()
+            if len(grades) == 0:
                 return 50
             
-            return total_score / total_ratings
+            return float(grades.map(_GRADE_SCORES).fillna(50).mean())
             
         except Exception as e:
             print(f"  Analyst error for {ticker}: {e}")
             return 50
     
+    @cached('trading_news', ttl=3600, empty=50)
     def get_news_sentiment(self, ticker):
         """
         Get news sentiment from yfinance news
         Returns: sentiment score (0-100)
         """
         try:
-            stock = yf.Ticker(ticker)
-            news = stock.news
+            news = _cached_news(ticker, _hour_bucket())
             
             if not news:
                 return 50
             
             # Simple keyword-based sentiment
-            positive_words = ['surge', 'soar', 'rally', 'gain', 'beat', 'growth', 'record', 'strong', 'bullish']
-            negative_words = ['drop', 'fall', 'plunge', 'loss', 'miss', 'weak', 'decline', 'bearish', 'concern']
-            
             sentiment_scores = []
             
             for article in news[:10]:  # Last 10 articles
                 title = article.get('title', '').lower()
                 
-                positive_count = sum(1 for word in positive_words if word in title)
-                negative_count = sum(1 for word in negative_words if word in title)
+                positive_count = _NEWS_POSITIVE.count(title)
+                negative_count = _NEWS_NEGATIVE.count(title)
                 
                 if positive_count > negative_count:
                     sentiment_scores.append(75)
@@ -157,7 +299,9 @@ class SentimentTradingSystem:
                 else:
                     sentiment_scores.append(50)
             
-            return np.mean(sentiment_scores) if sentiment_scores else 50
+            if not sentiment_scores:
+                return 50
+            return sum(sentiment_scores) / len(sentiment_scores)
             
         except Exception as e:
             print(f"  News error for {ticker}: {e}")
@@ -168,29 +312,27 @@ class SentimentTradingSystem:
         Combine all sentiment sources into one score
         Returns: score (0-100), signal ('STRONG_BUY', 'BUY', 'HOLD', 'SELL')
         """
-        print(f"  Analyzing {ticker}...", end='')
-        
-        # Get all sentiment sources
-        reddit_sentiment, reddit_mentions = self.get_reddit_sentiment(ticker)
-        analyst_score = self.get_analyst_ratings(ticker)
-        news_score = self.get_news_sentiment(ticker)
-        
-        # Weight the sources
-        weights = {
-            'analyst': 0.5,    # Analysts are most reliable
-            'news': 0.3,       # News is fairly reliable
-            'reddit': 0.2      # Reddit is least reliable but shows buzz
-        }
+        # Get all sentiment sources; Reddit and analyst hit different hosts,
+        # so Reddit runs on a helper thread while analyst runs here
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            reddit_future = executor.submit(self.get_reddit_sentiment, ticker)
+            analyst_score = self.get_analyst_ratings(ticker)
+            reddit_sentiment, reddit_mentions = reddit_future.result()
+        
+        # With no Reddit mentions the score is 10 + 0.5*analyst + 0.3*news,
+        # and news is within [25, 75], so 25 < analyst < 75 can only be a
+        # HOLD: skip the news fetch and count news as neutral
+        if reddit_mentions == 0 and 25 < analyst_score < 75:
+            news_score = 50
+        else:
+            news_score = self.get_news_sentiment(ticker)
         
         # Convert reddit sentiment (-1 to 1) to (0 to 100)
         reddit_score = (reddit_sentiment + 1) * 50
         
-        # Composite score
-        composite = (
-            weights['analyst'] * analyst_score +
-            weights['news'] * news_score +
-            weights['reddit'] * reddit_score
-        )
+        # Composite score: analysts are most reliable, news fairly reliable,
+        # Reddit least reliable but shows buzz
+        composite = 0.5 * analyst_score + 0.3 * news_score + 0.2 * reddit_score
         
         # Determine signal
         if composite >= 80 and reddit_mentions >= 5:
@@ -202,7 +344,8 @@ class SentimentTradingSystem:
         else:
             signal = 'HOLD'
         
-        print(f" Score: {composite:.1f} | Signal: {signal} | Reddit: {reddit_mentions} mentions")
+        with self._print_lock:
+            print(f"  [{ticker}] Score: {composite:.1f} | Signal: {signal} | Reddit: {reddit_mentions} mentions")
         
         return {
             'ticker': ticker,
@@ -217,28 +360,34 @@ class SentimentTradingSystem:
     def screen_universe(self, stock_universe, top_n=10):
         """
         Screen large universe and find top opportunities
+        Tickers are analyzed concurrently on self.max_workers threads
         """
         print(f"\n{'='*70}")
         print(f"SCREENING {len(stock_universe)} STOCKS FOR SENTIMENT")
         print(f"{'='*70}\n")
         
-        results = []
+        # Slots in input order, so ties rank like a serial run
+        scored = [None] * len(stock_universe)
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.calculate_composite_sentiment, ticker): i
+                       for i, ticker in enumerate(stock_universe)}
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    scored[i] = future.result()
+                except Exception as e:
+                    with self._print_lock:
+                        print(f"  ✗ {stock_universe[i]}: {e}")
         
-        for ticker in stock_universe:
-            try:
-                sentiment_data = self.calculate_composite_sentiment(ticker)
-                results.append(sentiment_data)
-                time.sleep(0.5)  # Rate limiting
-            except Exception as e:
-                print(f"  ✗ {ticker}: {e}")
-                continue
+        results = [result for result in scored if result is not None]
         
-        # Convert to DataFrame and sort
+        # Convert to DataFrame (screening order)
         df = pd.DataFrame(results)
-        df = df.sort_values('composite_score', ascending=False)
         
-        # Filter for buy signals
-        buy_signals = df[df['signal'].isin(['STRONG_BUY', 'BUY'])]
+        # Filter for buy signals, then sort just those
+        buy_signals = df[df['signal'].isin({'STRONG_BUY', 'BUY'})]
+        buy_signals = buy_signals.sort_values('composite_score', ascending=False, kind='stable')
         
         print(f"\n{'='*70}")
         print(f"TOP {top_n} OPPORTUNITIES")
@@ -246,8 +395,8 @@ class SentimentTradingSystem:
         print(f"{'Rank':<6}{'Ticker':<8}{'Signal':<15}{'Score':<10}{'Analyst':<10}{'News':<10}{'Reddit':<10}{'Buzz'}")
         print(f"{'-'*70}")
         
-        for idx, row in buy_signals.head(top_n).iterrows():
-            print(f"{len(buy_signals) - list(buy_signals.index).index(idx):<6}"
+        for rank, (_, row) in enumerate(buy_signals.head(top_n).iterrows(), 1):
+            print(f"{rank:<6}"
                   f"{row['ticker']:<8}"
                   f"{row['signal']:<15}"
                   f"{row['composite_score']:>7.1f}  "
@@ -258,6 +407,33 @@ class SentimentTradingSystem:
         
         return buy_signals.head(top_n), df
     
+    def prefetch_prices(self, tickers, start_date, end_date):
+        """
+        Download prices for many tickers in one batched request, for later
+        backtest_signal_based calls over the same window
+        """
+        tickers = [t for t in tickers if (t, start_date, end_date) not in self._price_cache]
+        if not tickers:
+            return
+        
+        try:
+            with self._host_limits['yahoo']:
+                data = yf.download(tickers, start=start_date, end=end_date,
+                                   group_by='ticker', threads=True, progress=False)
+        except Exception as e:
+            print(f"  Price prefetch error: {e}")
+            return
+        
+        if not isinstance(data.columns, pd.MultiIndex):
+            if len(tickers) != 1:
+                return
+            # Single ticker without a ticker level
+            data = pd.concat({tickers[0]: data}, axis=1)
+        
+        for ticker in set(data.columns.get_level_values(0)).intersection(tickers):
+            # The batch shares one date index; drop days this ticker has no bar
+            self._price_cache[(ticker, start_date, end_date)] = data[ticker].dropna(how='all')
+    
     def backtest_signal_based(self, ticker, start_date, end_date, 
                              check_interval_days=7):
         """
@@ -268,105 +444,90 @@ class SentimentTradingSystem:
         print(f"BACKTESTING {ticker} WITH SENTIMENT SIGNALS")
         print(f"{'='*70}")
         
-        # Download price data
-        data = yf.download(ticker, start=start_date, end=end_date, progress=False)
+        # Download price data, unless prefetch_prices() already batched it
+        data = self._price_cache.get((ticker, start_date, end_date))
         
-        if isinstance(data.columns, pd.MultiIndex):
-            data = data.xs(ticker, level=1, axis=1)
+        if data is None:
+            data = yf.download(ticker, start=start_date, end=end_date, progress=False)
+            
+            if isinstance(data.columns, pd.MultiIndex):
+                data = data.xs(ticker, level=1, axis=1)
         
         price_col = 'Adj Close' if 'Adj Close' in data.columns else 'Close'
         
-        cash = self.initial_capital
-        shares = 0
-        position_open = False
-        entry_price = 0
-        entry_date = None
-        portfolio_values = []
-        trades = []
+        # Walk trading days only; the cadence stays in calendar days
+        prices = data[price_col].loc[:end_date]
+        dates = prices.index
+        price_curve = prices.to_numpy(dtype=float)
+        check_days = np.flatnonzero((dates - start_date).days % check_interval_days == 0)
         
-        # Check sentiment periodically
-        current_date = start_date
+        # Sentiment on check days as int8 codes (0 = no trade); signals are
+        # reused within a calendar week, so short intervals don't refetch
+        weekly_sentiment = {}
+        sentiments = {}
+        signals = np.zeros(len(prices), dtype=np.int8)
         
-        while current_date <= end_date:
-            if current_date not in data.index:
-                current_date += timedelta(days=1)
-                continue
-            
-            price = data.loc[current_date, price_col]
+        for i in check_days:
+            week = dates[i].isocalendar()[:2]
+            sentiment = weekly_sentiment.get(week)
+            if sentiment is None:
+                sentiment = weekly_sentiment[week] = self.calculate_composite_sentiment(ticker)
+            sentiments[i] = sentiment
+            signals[i] = _SIGNAL_CODES.get(sentiment['signal'], 0)
+        
+        cash_curve, shares_curve, entry_idx, exit_idx, trade_shares = _run_backtest(
+            price_curve, signals, float(self.initial_capital))
+        
+        trades = []
+        
+        for entry, exit_, shares in zip(entry_idx.tolist(), exit_idx.tolist(),
+                                        trade_shares.tolist()):
+            entry_date = dates[entry]
+            entry_price = price_curve[entry]
+            sentiment = sentiments[entry]
             
-            # Check sentiment every N days
-            if (current_date - start_date).days % check_interval_days == 0:
-                sentiment = self.calculate_composite_sentiment(ticker)
-                signal = sentiment['signal']
-                
-                # BUY signal
-                if signal in ['STRONG_BUY', 'BUY'] and not position_open:
-                    shares = int(cash / price)
-                    if shares > 0:
-                        cost = shares * price
-                        cash -= cost
-                        position_open = True
-                        entry_price = price
-                        entry_date = current_date
-                        
-                        print(f"\n  🟢 BUY  {current_date.date()}: {shares} shares @ ${price:.2f}")
-                        print(f"     Signal: {signal} | Score: {sentiment['composite_score']:.1f}")
-                
-                # SELL signal
-                elif signal == 'SELL' and position_open:
-                    revenue = shares * price
-                    cash += revenue
-                    profit = (price - entry_price) * shares
-                    profit_pct = ((price - entry_price) / entry_price) * 100
-                    days_held = (current_date - entry_date).days
-                    
-                    trades.append({
-                        'entry_date': entry_date,
-                        'entry_price': entry_price,
-                        'exit_date': current_date,
-                        'exit_price': price,
-                        'shares': shares,
-                        'profit': profit,
-                        'profit_pct': profit_pct,
-                        'days_held': days_held
-                    })
-                    
-                    print(f"\n  🔴 SELL {current_date.date()}: ${profit:,.2f} profit ({profit_pct:+.1f}%)")
-                    print(f"     Signal: {signal} | Held: {days_held} days")
-                    
-                    shares = 0
-                    position_open = False
+            print(f"\n  🟢 BUY  {entry_date.date()}: {shares} shares @ ${entry_price:.2f}")
+            print(f"     Signal: {sentiment['signal']} | Score: {sentiment['composite_score']:.1f}")
             
-            # Track portfolio value
-            portfolio_value = cash + shares * price
-            portfolio_values.append({
-                'date': current_date,
-                'price': price,
-                'shares': shares,
-                'cash': cash,
-                'total_value': portfolio_value
-            })
+            # Close position at end
+            if exit_ < 0:
+                exit_date = end_date
+                exit_price = price_curve[-1]
+            else:
+                exit_date = dates[exit_]
+                exit_price = price_curve[exit_]
             
-            current_date += timedelta(days=1)
-        
-        # Close position at end
-        if position_open:
-            final_price = data[price_col].iloc[-1]
-            revenue = shares * final_price
-            cash += revenue
-            profit = (final_price - entry_price) * shares
-            profit_pct = ((final_price - entry_price) / entry_price) * 100
+            profit = (exit_price - entry_price) * shares
+            profit_pct = ((exit_price - entry_price) / entry_price) * 100
+            days_held = (exit_date - entry_date).days
             
             trades.append({
                 'entry_date': entry_date,
                 'entry_price': entry_price,
-                'exit_date': end_date,
-                'exit_price': final_price,
+                'exit_date': exit_date,
+                'exit_price': exit_price,
                 'shares': shares,
                 'profit': profit,
                 'profit_pct': profit_pct,
-                'days_held': (end_date - entry_date).days
+                'days_held': days_held
             })
+            
+            if exit_ >= 0:
+                print(f"\n  🔴 SELL {exit_date.date()}: ${profit:,.2f} profit ({profit_pct:+.1f}%)")
+                print(f"     Signal: {sentiments[exit_]['signal']} | Held: {days_held} days")
+        
+        # Track portfolio value
+        portfolio_values = pd.DataFrame({
+            'date': dates,
+            'price': price_curve,
+            'shares': shares_curve,
+            'cash': cash_curve,
+            'total_value': cash_curve + shares_curve * price_curve
+        })
+        
+        cash = cash_curve[-1] if len(cash_curve) else self.initial_capital
+        if trades and exit_idx[-1] < 0:
+            cash += trades[-1]['shares'] * trades[-1]['exit_price']
         
         # Calculate metrics
         final_value = cash
@@ -381,9 +542,10 @@ class SentimentTradingSystem:
         print(f"Total Trades:     {len(trades)}")
         
         if trades:
-            winning = [t for t in trades if t['profit'] > 0]
-            print(f"Win Rate:         {len(winning)/len(trades)*100:.1f}%")
-            print(f"Avg Profit:       ${np.mean([t['profit'] for t in trades]):,.2f}")
+            profits = np.fromiter((t['profit'] for t in trades), dtype=np.float64,
+                                  count=len(trades))
+            print(f"Win Rate:         {(profits > 0).mean()*100:.1f}%")
+            print(f"Avg Profit:       ${profits.mean():,.2f}")
         
         return {
             'final_value': final_value,
@@ -393,55 +555,43 @@ class SentimentTradingSystem:
         }
 
 
-# Large stock universe for screening
-def get_large_stock_universe():
-    """
-    Get 200+ stocks across all sectors for comprehensive screening
-    """
-    
+# Large stock universe for screening (duplicates across sectors removed)
+_UNIVERSE = tuple(sorted(frozenset().union(
     # Mega-cap tech
-    tech = ['AAPL', 'MSFT', 'GOOGL', 'GOOG', 'AMZN', 'META', 'NVDA', 'TSLA', 'AVGO']
-    
+    ('AAPL', 'MSFT', 'GOOGL', 'GOOG', 'AMZN', 'META', 'NVDA', 'TSLA', 'AVGO'),
     # Semiconductors (hot sector)
-    semis = ['AMD', 'INTC', 'QCOM', 'TXN', 'AMAT', 'LRCX', 'KLAC', 'MU', 'MRVL', 'ADI',
-             'NXPI', 'MCHP', 'ON', 'MPWR', 'SWKS', 'QRVO', 'ASML', 'TSM']
-    
+    ('AMD', 'INTC', 'QCOM', 'TXN', 'AMAT', 'LRCX', 'KLAC', 'MU', 'MRVL', 'ADI',
+     'NXPI', 'MCHP', 'ON', 'MPWR', 'SWKS', 'QRVO', 'ASML', 'TSM'),
     # Cloud/SaaS
-    cloud = ['CRM', 'NOW', 'SNOW', 'DDOG', 'TEAM', 'WDAY', 'ZM', 'CRWD', 'OKTA', 'NET',
-             'DOCU', 'TWLO', 'ZS', 'PANW', 'FTNT', 'MDB', 'PLTR', 'U']
-    
+    ('CRM', 'NOW', 'SNOW', 'DDOG', 'TEAM', 'WDAY', 'ZM', 'CRWD', 'OKTA', 'NET',
+     'DOCU', 'TWLO', 'ZS', 'PANW', 'FTNT', 'MDB', 'PLTR', 'U'),
     # Financials
-    finance = ['JPM', 'BAC', 'WFC', 'C', 'GS', 'MS', 'AXP', 'BLK', 'SCHW', 'USB',
-               'V', 'MA', 'PYPL', 'SQ', 'COIN', 'SOFI']
-    
+    ('JPM', 'BAC', 'WFC', 'C', 'GS', 'MS', 'AXP', 'BLK', 'SCHW', 'USB',
+     'V', 'MA', 'PYPL', 'SQ', 'COIN', 'SOFI'),
     # Healthcare
-    health = ['UNH', 'JNJ', 'PFE', 'ABBV', 'LLY', 'TMO', 'ABT', 'DHR', 'BMY', 'AMGN',
-              'GILD', 'VRTX', 'REGN', 'ISRG', 'MRNA', 'BNTX', 'ZTS', 'DXCM']
-    
+    ('UNH', 'JNJ', 'PFE', 'ABBV', 'LLY', 'TMO', 'ABT', 'DHR', 'BMY', 'AMGN',
+     'GILD', 'VRTX', 'REGN', 'ISRG', 'MRNA', 'BNTX', 'ZTS', 'DXCM'),
     # Consumer
-    consumer = ['AMZN', 'TSLA', 'WMT', 'HD', 'COST', 'NKE', 'MCD', 'SBUX', 'TGT', 'LOW',
-                'DIS', 'NFLX', 'CMCSA', 'PG', 'KO', 'PEP']
-    
+    ('AMZN', 'TSLA', 'WMT', 'HD', 'COST', 'NKE', 'MCD', 'SBUX', 'TGT', 'LOW',
+     'DIS', 'NFLX', 'CMCSA', 'PG', 'KO', 'PEP'),
     # Energy (momentum sector)
-    energy = ['XOM', 'CVX', 'COP', 'SLB', 'EOG', 'PXD', 'MPC', 'PSX', 'VLO', 'OXY']
-    
+    ('XOM', 'CVX', 'COP', 'SLB', 'EOG', 'PXD', 'MPC', 'PSX', 'VLO', 'OXY'),
     # Industrials
-    industrial = ['BA', 'CAT', 'HON', 'UPS', 'RTX', 'LMT', 'GE', 'DE', 'MMM', 'FDX']
-    
+    ('BA', 'CAT', 'HON', 'UPS', 'RTX', 'LMT', 'GE', 'DE', 'MMM', 'FDX'),
     # E-commerce & Digital
-    ecom = ['SHOP', 'MELI', 'BABA', 'JD', 'PDD', 'SE', 'EBAY', 'ETSY', 'W', 'CHWY']
-    
+    ('SHOP', 'MELI', 'BABA', 'JD', 'PDD', 'SE', 'EBAY', 'ETSY', 'W', 'CHWY'),
     # EV & Clean Energy
-    ev = ['TSLA', 'RIVN', 'LCID', 'NIO', 'XPEV', 'PLUG', 'ENPH', 'SEDG', 'RUN']
-    
+    ('TSLA', 'RIVN', 'LCID', 'NIO', 'XPEV', 'PLUG', 'ENPH', 'SEDG', 'RUN'),
     # Biotech
-    biotech = ['MRNA', 'BNTX', 'REGN', 'VRTX', 'BIIB', 'GILD', 'ALNY', 'SGEN', 'BMRN']
-    
-    # Combine all (remove duplicates)
-    all_stocks = list(set(tech + semis + cloud + finance + health + consumer + 
-                          energy + industrial + ecom + ev + biotech))
-    
-    return sorted(all_stocks)
+    ('MRNA', 'BNTX', 'REGN', 'VRTX', 'BIIB', 'GILD', 'ALNY', 'SGEN', 'BMRN'),
+)))
+
+
+def get_large_stock_universe():
+    """
+    Get 200+ stocks across all sectors for comprehensive screening
+    """
+    return list(_UNIVERSE)
 
 
 # Example usage
@@ -465,7 +615,7 @@ if __name__ == "__main__":
     
     # Screen for opportunities (use subset for speed)
     print("\n⚠️  Screening 50 stocks (for demo - adjust as needed)...")
-    print("⚠️  This takes ~2-5 minutes due to API rate limits...")
+    print("⚠️  This takes ~3 minutes due to API rate limits...")
     
     top_stocks, all_scores = system.screen_universe(
         universe[:50],  # First 50 for speed
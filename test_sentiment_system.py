@@ -1,27 +1,185 @@
 """
 COMPREHENSIVE TEST SUITE FOR FREE SENTIMENT SYSTEM
 Tests all components to ensure everything works correctly
+
+Run directly (python test_sentiment_system.py [--fast]) for the report,
+or under pytest (pytest test_sentiment_system.py, -n 4 with pytest-xdist)
 """
 
+import asyncio
+import atexit
+import importlib.util
+import io
+import shutil
 import sys
+import tempfile
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime
 
+try:
+    import pytest  # optional, only needed to run the suite under pytest
+except ImportError:
+    pytest = None
+
 def print_header(text):
-    """Print formatted header"""
-    print(f"\n{'='*80}")
-    print(f"{text.center(80)}")
-    print(f"{'='*80}\n")
+    """Print formatted header (flushing the previous section first)"""
+    sys.stdout.flush()
+    sys.stdout.write(f"\n{'='*80}\n{text.center(80)}\n{'='*80}\n\n")
+
+_FMT = "{symbol} {name:<50} [{status}]\n"
+
+@dataclass(slots=True)
+class TestResult:
+    """Outcome of one suite-level test"""
+    __test__ = False  # not a pytest test class
+    
+    name: str
+    passed: bool
 
 def print_test(test_name, status, message=""):
     """Print test result"""
-    symbol = "✓" if status else "✗"
-    status_text = "PASS" if status else "FAIL"
-    print(f"{symbol} {test_name:<50} [{status_text}]")
+    line = _FMT.format_map({'symbol': "✓" if status else "✗", 'name': test_name,
+                            'status': "PASS" if status else "FAIL"})
     if message:
-        print(f"  {message}")
+        line += f"  {message}\n"
+    sys.stdout.write(line)
 
-def test_imports():
+class RateLimiter:
+    """
+    Sliding-window limiter: acquire() blocks only once `calls` acquisitions
+    have happened within the last `period` seconds
+    """
+    
+    def __init__(self, calls, period):
+        self.calls = calls
+        self.period = period
+        self._times = deque()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._times and now - self._times[0] >= self.period:
+                    self._times.popleft()
+                
+                if len(self._times) < self.calls:
+                    self._times.append(now)
+                    return
+                
+                wait = self.period - (now - self._times[0])
+            
+            # Sleep without the lock, then retry, so other threads are not
+            # queued behind a sleeper
+            time.sleep(wait)
+
+# StockTwits allows 200 requests/hour; each StockTwits call takes a token
+stocktwits_limiter = RateLimiter(200, 3600)
+
+def gather_tickers(fetch, tickers, limit=3, limiter=None):
+    """
+    Run fetch(ticker) for every ticker concurrently on worker threads, at
+    most `limit` at a time, taking a token from `limiter` (if given) per
+    call. Returns results (or raised exceptions) in order.
+    """
+    async def run_all():
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(limit)
+        
+        def limited(ticker):
+            if limiter:
+                limiter.acquire()
+            return fetch(ticker)
+        
+        async def one(ticker):
+            async with semaphore:
+                return await loop.run_in_executor(None, limited, ticker)
+        
+        return await asyncio.gather(*(one(ticker) for ticker in tickers),
+                                    return_exceptions=True)
+    
+    return asyncio.run(run_all())
+
+class ThreadBufferedStdout:
+    """
+    sys.stdout stand-in that sends a thread's writes to its own buffer
+    while one is set (self.local.buffer), and to the real stream otherwise
+    """
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+    
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        return (buffer or self.stream).write(text)
+    
+    def flush(self):
+        self.stream.flush()
+    
+    def __getattr__(self, name):
+        # Everything else (encoding, isatty, fileno, ...) is the real stream's
+        return getattr(self.stream, name)
+
+def run_concurrently(tests, analyzer):
+    """
+    Run test functions side by side on threads. Each test's report is
+    buffered and printed in order once all have finished, so output
+    doesn't interleave. Returns their results in order.
+    """
+    stdout = sys.stdout
+    proxy = ThreadBufferedStdout(stdout)
+    
+    def run(test):
+        proxy.local.buffer = io.StringIO()
+        try:
+            return test(analyzer), proxy.local.buffer.getvalue()
+        finally:
+            proxy.local.buffer = None
+    
+    async def run_all():
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=len(tests)) as pool:
+            return await asyncio.gather(*(loop.run_in_executor(pool, run, test)
+                                          for test in tests))
+    
+    sys.stdout = proxy
+    try:
+        outcomes = asyncio.run(run_all())
+    finally:
+        sys.stdout = stdout
+    
+    for _, output in outcomes:
+        stdout.write(output)
+    return [result for result, _ in outcomes]
+
+def memoize_composite(analyzer):
+    """
+    Cache analyzer.calculate_composite_score per ticker for the rest of the
+    run; the cache (analyzer.composite_cache) can also be seeded with rows
+    from a screen, which have the same fields
+    """
+    cache = {}
+    score = analyzer.calculate_composite_score
+    
+    def cached_score(ticker):
+        if ticker not in cache:
+            cache[ticker] = score(ticker)
+        return cache[ticker]
+    
+    analyzer.calculate_composite_score = cached_score
+    analyzer.composite_cache = cache
+
+def is_installed(module):
+    """True if module can be imported; finds it without importing it"""
+    return module in sys.modules or importlib.util.find_spec(module) is not None
+
+def check_imports():
     """Test 1: Check if all required libraries are installed"""
     print_header("TEST 1: CHECKING DEPENDENCIES")
     
@@ -37,17 +195,34 @@ def test_imports():
     }
     
     for module, package in required.items():
-        try:
-            __import__(module)
+        if is_installed(module):
             print_test(f"Import {package}", True)
-        except ImportError:
+        else:
             print_test(f"Import {package}", False, 
                       f"Install with: pip install {package}")
             all_passed = False
     
+    # Optional accelerators: the systems fall back to slower pure-Python
+    # paths without them, so these never fail the test
+    optional = {
+        'lxml': ('lxml', 'C HTML parser for Finviz/Reddit scraping (instead of bs4)'),
+        'orjson': ('orjson', 'faster JSON parsing'),
+        'brotli': ('brotli', 'brotli-compressed responses'),
+        're2': ('google-re2', 'DFA keyword matching'),
+        'ahocorasick': ('pyahocorasick', 'single-pass keyword matching'),
+        'numba': ('numba', 'compiled backtest kernel'),
+    }
+    
+    print("\nOptional speedups:")
+    for module, (package, purpose) in optional.items():
+        if is_installed(module):
+            print(f"  ✓ {package:<15} {purpose}")
+        else:
+            print(f"  - {package:<15} not installed ({purpose}): pip install {package}")
+    
     return all_passed
 
-def test_system_import():
+def check_system_import():
     """Test 2: Check if our sentiment system imports correctly"""
     print_header("TEST 2: IMPORTING SENTIMENT SYSTEM")
     
@@ -55,26 +230,35 @@ def test_system_import():
         from free_sentiment_system import FreeSentimentAnalyzer
         print_test("Import FreeSentimentAnalyzer", True)
         
-        # Try to initialize
-        analyzer = FreeSentimentAnalyzer()
+        # Try to initialize, with a cache private to this run so the live
+        # API checks never pass on responses left over from an earlier one
+        cache_dir = tempfile.mkdtemp(prefix='sentiment_tests_')
+        atexit.register(shutil.rmtree, cache_dir, ignore_errors=True)
+        analyzer = FreeSentimentAnalyzer(cache_dir=cache_dir)
         print_test("Initialize FreeSentimentAnalyzer", True)
+        memoize_composite(analyzer)
         
         return True, analyzer
     except Exception as e:
         print_test("Import/Initialize System", False, str(e))
         return False, None
 
-def test_stocktwits_api(analyzer):
+def check_stocktwits_api(analyzer):
     """Test 3: Test StockTwits API (most important!)"""
     print_header("TEST 3: STOCKTWITS API (CRITICAL)")
     
     test_tickers = ['AAPL', 'TSLA', 'GME']
     passed = 0
     
-    for ticker in test_tickers:
+    results = gather_tickers(analyzer.get_stocktwits_sentiment, test_tickers,
+                             limiter=stocktwits_limiter)
+    
+    for ticker, result in zip(test_tickers, results):
         try:
             print(f"\nTesting {ticker}...")
-            score, total, bullish, bearish = analyzer.get_stocktwits_sentiment(ticker)
+            if isinstance(result, Exception):
+                raise result
+            score, total, bullish, bearish = result
             
             if total > 0:
                 print_test(f"StockTwits {ticker}", True,
@@ -85,27 +269,33 @@ def test_stocktwits_api(analyzer):
                           "No messages returned (API might be down)")
         except Exception as e:
             print_test(f"StockTwits {ticker}", False, str(e))
-        
-        time.sleep(1)  # Be polite
     
     success = passed >= 2  # At least 2 out of 3 should work
     print(f"\n📊 StockTwits Results: {passed}/3 successful")
     
     return success
 
-def test_yahoo_finance(analyzer):
+def check_yahoo_finance(analyzer):
     """Test 4: Test Yahoo Finance data"""
     print_header("TEST 4: YAHOO FINANCE DATA")
     
     test_tickers = ['AAPL', 'MSFT']
     passed = 0
     
-    for ticker in test_tickers:
+    def fetch(ticker):
+        return (analyzer.get_yahoo_news_sentiment(ticker),
+                analyzer.get_analyst_ratings(ticker))
+    
+    results = gather_tickers(fetch, test_tickers)
+    
+    for ticker, result in zip(test_tickers, results):
         try:
             print(f"\nTesting {ticker}...")
+            if isinstance(result, Exception):
+                raise result
+            (news_score, news_count), analyst = result
             
             # Test news sentiment
-            news_score, news_count = analyzer.get_yahoo_news_sentiment(ticker)
             if news_count > 0:
                 print_test(f"Yahoo News {ticker}", True,
                           f"Score: {news_score:.1f}, Articles: {news_count}")
@@ -113,7 +303,7 @@ def test_yahoo_finance(analyzer):
                 print_test(f"Yahoo News {ticker}", False, "No news articles")
             
             # Test analyst ratings
-            analyst_score, rec, upside, num = analyzer.get_analyst_ratings(ticker)
+            analyst_score, rec, upside, num = analyst
             if analyst_score != 50:  # 50 is default/error
                 print_test(f"Analyst Ratings {ticker}", True,
                           f"Rating: {rec}, Score: {analyst_score:.1f}, Upside: {upside:.1f}%")
@@ -123,25 +313,28 @@ def test_yahoo_finance(analyzer):
             
         except Exception as e:
             print_test(f"Yahoo Finance {ticker}", False, str(e))
-        
-        time.sleep(1)
     
     success = passed >= 1
     print(f"\n📊 Yahoo Finance Results: {passed}/2 successful")
     
     return success
 
-def test_price_momentum(analyzer):
+def check_price_momentum(analyzer):
     """Test 5: Test price momentum calculation"""
     print_header("TEST 5: PRICE MOMENTUM ANALYSIS")
     
     test_tickers = ['NVDA', 'AMD']
     passed = 0
     
-    for ticker in test_tickers:
+    # One batched price download for all test tickers
+    analyzer.prefetch(test_tickers)
+    results = gather_tickers(analyzer.get_price_momentum, test_tickers)
+    
+    for ticker, momentum_score in zip(test_tickers, results):
         try:
             print(f"\nTesting {ticker}...")
-            momentum_score = analyzer.get_price_momentum(ticker)
+            if isinstance(momentum_score, Exception):
+                raise momentum_score
             
             if momentum_score != 50:  # 50 is neutral/error
                 print_test(f"Momentum {ticker}", True,
@@ -152,15 +345,13 @@ def test_price_momentum(analyzer):
                           "Neutral score (might be error)")
         except Exception as e:
             print_test(f"Momentum {ticker}", False, str(e))
-        
-        time.sleep(1)
     
     success = passed >= 1
     print(f"\n📊 Momentum Analysis Results: {passed}/2 successful")
     
     return success
 
-def test_web_scraping(analyzer):
+def check_web_scraping(analyzer):
     """Test 6: Test web scraping (Finviz, Reddit)"""
     print_header("TEST 6: WEB SCRAPING (OPTIONAL)")
     
@@ -180,8 +371,6 @@ def test_web_scraping(analyzer):
     except Exception as e:
         print_test("Finviz Scraping", False, str(e))
     
-    time.sleep(2)
-    
     # Test Reddit
     try:
         print("\nTesting Reddit...")
@@ -198,16 +387,20 @@ def test_web_scraping(analyzer):
     print("\n⚠️  Web scraping is optional - StockTwits is the primary source")
     return True  # Always pass since optional
 
-def test_composite_scoring(analyzer):
+def check_composite_scoring(analyzer):
     """Test 7: Test complete composite scoring"""
     print_header("TEST 7: COMPOSITE SCORING")
     
     test_tickers = ['NVDA', 'PLTR']
     passed = 0
     
+    # One batched price download for all test tickers
+    analyzer.prefetch(test_tickers)
+    
     for ticker in test_tickers:
         try:
             print(f"\nTesting full analysis for {ticker}...")
+            stocktwits_limiter.acquire()  # the composite includes a StockTwits call
             result = analyzer.calculate_composite_score(ticker)
             
             if result and result['composite_score'] > 0:
@@ -222,34 +415,40 @@ def test_composite_scoring(analyzer):
                           "No valid result returned")
         except Exception as e:
             print_test(f"Composite Score {ticker}", False, str(e))
-        
-        time.sleep(2)
     
     success = passed >= 1
     print(f"\n📊 Composite Scoring Results: {passed}/2 successful")
     
     return success
 
-def test_screening(analyzer):
+def check_screening(analyzer, max_workers=5):
     """Test 8: Test screening multiple stocks"""
     print_header("TEST 8: BATCH SCREENING")
     
-    print("Screening 5 stocks (this takes ~1 minute)...\n")
+    print(f"Screening 5 stocks on {max_workers} threads...\n")
     
     test_stocks = ['AAPL', 'TSLA', 'NVDA', 'AMD', 'PLTR']
     
     try:
-        top_picks, all_results = analyzer.screen_stocks(test_stocks, top_n=5)
+        top_picks, all_results = analyzer.screen_stocks(test_stocks, top_n=5,
+                                                        max_workers=max_workers)
+        
+        # Later tests reuse these scores instead of rescoring the tickers
+        if hasattr(analyzer, 'composite_cache') and len(all_results) > 0:
+            analyzer.composite_cache.update(
+                (row['ticker'], row) for row in all_results.to_dict('records'))
         
         if len(all_results) >= 3:  # At least 3 out of 5 should work
             print_test("Batch Screening", True,
                       f"Successfully analyzed {len(all_results)}/5 stocks")
             
             print("\n📊 Results Preview:")
-            print(all_results[['ticker', 'composite_score', 'signal']].head())
+            for row in all_results.head().itertuples(index=False):
+                print(f"  {row.ticker:<6} {row.composite_score:>6.1f}  {row.signal}")
             
             if len(top_picks) > 0:
-                print(f"\n🏆 Top Pick: {top_picks.iloc[0]['ticker']} (Score: {top_picks.iloc[0]['composite_score']:.1f})")
+                best = next(top_picks.itertuples(index=False))
+                print(f"\n🏆 Top Pick: {best.ticker} (Score: {best.composite_score:.1f})")
             
             return True
         else:
@@ -261,7 +460,7 @@ def test_screening(analyzer):
         print_test("Batch Screening", False, str(e))
         return False
 
-def test_data_quality(analyzer):
+def check_data_quality(analyzer):
     """Test 9: Verify data quality"""
     print_header("TEST 9: DATA QUALITY CHECKS")
     
@@ -307,24 +506,23 @@ def test_data_quality(analyzer):
         print_test("Data Quality", False, str(e))
         return False
 
-def test_performance():
+def check_performance(analyzer):
     """Test 10: Performance benchmarks"""
     print_header("TEST 10: PERFORMANCE BENCHMARKS")
     
     try:
-        from free_sentiment_system import FreeSentimentAnalyzer
-        analyzer = FreeSentimentAnalyzer()
-        
-        # Test single stock speed
+        # Test single stock speed on the shared analyzer, past the test memo
+        # so it is a real scoring run; its session and caches are already
+        # warm from the earlier tests, so this is a warm figure
         start = time.time()
-        analyzer.calculate_composite_score('AAPL')
+        type(analyzer).calculate_composite_score(analyzer, 'AAPL')
         duration = time.time() - start
         
         if duration < 5:
-            print_test("Single stock analysis speed", True,
+            print_test("Single stock analysis speed (warm)", True,
                       f"Completed in {duration:.2f} seconds (< 5s target)")
         else:
-            print_test("Single stock analysis speed", False,
+            print_test("Single stock analysis speed (warm)", False,
                       f"Took {duration:.2f} seconds (> 5s)")
         
         # Estimate batch time
@@ -337,109 +535,201 @@ def test_performance():
         print_test("Performance Test", False, str(e))
         return False
 
-def run_all_tests():
-    """Run complete test suite"""
+@contextmanager
+def block_buffered_stdout():
+    """
+    Switch sys.stdout from line buffering (the default on a terminal) to
+    block buffering until exit; print_header flushes once per section
+    """
+    stream = sys.stdout
+    if not hasattr(stream, 'reconfigure'):
+        yield
+        return
+    
+    line_buffering = stream.line_buffering
+    stream.reconfigure(line_buffering=False)
+    try:
+        yield
+    finally:
+        stream.flush()
+        stream.reconfigure(line_buffering=line_buffering)
+
+def run_all_tests(mode='full'):
+    """
+    Run complete test suite
+    mode='fast' runs only the critical tests (1, 2, 3 and 7)
+    """
+    with block_buffered_stdout():
+        _run_all_tests(mode)
+
+def _run_all_tests(mode):
+    """Test sequence and summary behind run_all_tests()"""
     print("\n" + "="*80)
     print("FREE SENTIMENT SYSTEM - COMPREHENSIVE TEST SUITE".center(80))
     print("="*80)
-    print(f"\nTest started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"\nTest started at: {datetime.now().isoformat(sep=' ', timespec='seconds')}")
     print("="*80)
     
-    results = {}
+    results: list[TestResult] = []
     
     # Test 1: Dependencies
-    results['dependencies'] = test_imports()
+    results.append(TestResult('dependencies', check_imports()))
     
-    if not results['dependencies']:
+    if not results[-1].passed:
         print("\n❌ CRITICAL: Missing dependencies. Install them first!")
         print("Run: pip install yfinance pandas numpy requests beautifulsoup4")
         return
     
     # Test 2: System Import
-    results['import'], analyzer = test_system_import()
+    imported, analyzer = check_system_import()
+    results.append(TestResult('import', imported))
     
-    if not results['import']:
+    if not imported:
         print("\n❌ CRITICAL: Cannot import system. Check free_sentiment_system.py")
         return
     
-    # Test 3: StockTwits (Most Important!)
-    results['stocktwits'] = test_stocktwits_api(analyzer)
-    
-    # Test 4: Yahoo Finance
-    results['yahoo'] = test_yahoo_finance(analyzer)
-    
-    # Test 5: Price Momentum
-    results['momentum'] = test_price_momentum(analyzer)
-    
-    # Test 6: Web Scraping (Optional)
-    results['scraping'] = test_web_scraping(analyzer)
-    
-    # Test 7: Composite Scoring
-    results['composite'] = test_composite_scoring(analyzer)
-    
-    # Test 8: Batch Screening
-    results['screening'] = test_screening(analyzer)
-    
-    # Test 9: Data Quality
-    results['quality'] = test_data_quality(analyzer)
-    
-    # Test 10: Performance
-    results['performance'] = test_performance()
+    if mode == 'fast':
+        # Critical tests only: StockTwits and composite scoring, side by side
+        outcomes = run_concurrently([check_stocktwits_api, check_composite_scoring], analyzer)
+        results.extend(map(TestResult, ['stocktwits', 'composite'], outcomes))
+    else:
+        # Tests 3-6 hit different hosts, so run them side by side:
+        # StockTwits (most important!), Yahoo Finance, price momentum and
+        # web scraping (optional)
+        outcomes = run_concurrently(
+            [check_stocktwits_api, check_yahoo_finance, check_price_momentum, check_web_scraping],
+            analyzer)
+        results.extend(map(TestResult, ['stocktwits', 'yahoo', 'momentum', 'scraping'], outcomes))
+        
+        # Test 7: Composite Scoring
+        results.append(TestResult('composite', check_composite_scoring(analyzer)))
+        
+        # Test 8: Batch Screening
+        results.append(TestResult('screening', check_screening(analyzer)))
+        
+        # Test 9: Data Quality
+        results.append(TestResult('quality', check_data_quality(analyzer)))
+        
+        # Test 10: Performance
+        results.append(TestResult('performance', check_performance(analyzer)))
+        
     
     # Summary
     print_header("TEST SUMMARY")
     
+    # Tally everything in one pass over the results; the report below
+    # lists them in this fixed order, whatever order they ran in
+    critical_tests = ('dependencies', 'import', 'stocktwits', 'composite')
+    optional_tests = ('scraping', 'yahoo', 'momentum', 'screening', 'quality', 'performance')
+    passed = critical_passed = 0
+    status = {}
+    
+    for result in results:
+        status[result.name] = result.passed
+        passed += result.passed
+        if result.name in critical_tests:
+            critical_passed += result.passed
+    
+    stocktwits_passed = status.get('stocktwits', False)
+    critical_lines = [f"  {name.title():<20} {'✓ PASS' if status[name] else '✗ FAIL'}"
+                      for name in critical_tests if name in status]
+    optional_lines = [f"  {name.title():<20} {'✓ PASS' if status[name] else '✗ FAIL'}"
+                      for name in optional_tests if name in status]
+    
+    # The report is collected and written out in one go
     total = len(results)
-    passed = sum(results.values())
-    
-    print(f"Total Tests: {total}")
-    print(f"Passed: {passed}")
-    print(f"Failed: {total - passed}")
-    print(f"Success Rate: {(passed/total)*100:.1f}%\n")
-    
-    # Critical tests
-    critical_tests = ['dependencies', 'import', 'stocktwits', 'composite']
-    critical_passed = sum(results[test] for test in critical_tests if test in results)
-    
-    print("Critical Tests (Must Pass):")
-    for test in critical_tests:
-        status = "✓ PASS" if results.get(test, False) else "✗ FAIL"
-        print(f"  {test.title():<20} {status}")
-    
-    print("\nOptional Tests (Nice to Have):")
-    optional_tests = ['scraping', 'yahoo', 'momentum', 'screening', 'quality', 'performance']
-    for test in optional_tests:
-        if test in results:
-            status = "✓ PASS" if results[test] else "✗ FAIL"
-            print(f"  {test.title():<20} {status}")
+    lines = [
+        f"Total Tests: {total}",
+        f"Passed: {passed}",
+        f"Failed: {total - passed}",
+        f"Success Rate: {(passed/total)*100:.1f}%\n",
+        "Critical Tests (Must Pass):",
+        *critical_lines,
+    ]
+    
+    if optional_lines:
+        lines.append("\nOptional Tests (Nice to Have):")
+        lines.extend(optional_lines)
     
     # Final verdict
-    print("\n" + "="*80)
+    lines.append("\n" + "="*80)
     if critical_passed == len(critical_tests):
-        print("✅ SYSTEM IS READY TO USE!")
-        print("="*80)
-        print("\nThe system is working correctly!")
-        print("StockTwits API is functional (most important)")
-        print("\nYou can now run: python free_sentiment_system.py")
-    elif results.get('stocktwits', False):
-        print("⚠️  SYSTEM IS PARTIALLY FUNCTIONAL")
-        print("="*80)
-        print("\nStockTwits works (main data source)")
-        print("Some other features may be limited")
-        print("\nYou can still use the system, but results may vary")
+        lines.append("✅ SYSTEM IS READY TO USE!")
+        lines.append("="*80)
+        lines.append("\nThe system is working correctly!")
+        lines.append("StockTwits API is functional (most important)")
+        lines.append("\nYou can now run: python free_sentiment_system.py")
+    elif stocktwits_passed:
+        lines.append("⚠️  SYSTEM IS PARTIALLY FUNCTIONAL")
+        lines.append("="*80)
+        lines.append("\nStockTwits works (main data source)")
+        lines.append("Some other features may be limited")
+        lines.append("\nYou can still use the system, but results may vary")
     else:
-        print("❌ SYSTEM HAS CRITICAL ISSUES")
-        print("="*80)
-        print("\nStockTwits API is not working")
-        print("This is the primary data source - system won't work properly")
-        print("\nPossible causes:")
-        print("  • Internet connection issues")
-        print("  • StockTwits API is down")
-        print("  • Network firewall blocking requests")
-    
-    print("\n" + "="*80)
-    print(f"Test completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("="*80 + "\n")
+        lines.append("❌ SYSTEM HAS CRITICAL ISSUES")
+        lines.append("="*80)
+        lines.append("\nStockTwits API is not working")
+        lines.append("This is the primary data source - system won't work properly")
+        lines.append("\nPossible causes:")
+        lines.append("  • Internet connection issues")
+        lines.append("  • StockTwits API is down")
+        lines.append("  • Network firewall blocking requests")
+    
+    lines.append("\n" + "="*80)
+    lines.append(f"Test completed at: {datetime.now().isoformat(sep=' ', timespec='seconds')}")
+    lines.append("="*80 + "\n")
+    
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+# pytest entry points: the same checks as the report, asserting instead of
+# returning, with one shared analyzer per pytest (or xdist worker) session
+if pytest is not None:
+    @pytest.fixture(scope='session')
+    def analyzer():
+        ok, instance = check_system_import()
+        if not ok:
+            pytest.skip("FreeSentimentAnalyzer could not be initialized")
+        return instance
+
+def test_imports():
+    assert check_imports()
+
+def test_system_import():
+    assert check_system_import()[0]
+
+def test_stocktwits_api(analyzer):
+    assert check_stocktwits_api(analyzer)
+
+def test_yahoo_finance(analyzer):
+    assert check_yahoo_finance(analyzer)
+
+def test_price_momentum(analyzer):
+    assert check_price_momentum(analyzer)
+
+def test_web_scraping(analyzer):
+    assert check_web_scraping(analyzer)
+
+def test_composite_scoring(analyzer):
+    assert check_composite_scoring(analyzer)
+
+def test_screening(analyzer):
+    assert check_screening(analyzer)
+
+def test_data_quality(analyzer):
+    assert check_data_quality(analyzer)
+
+def test_performance(analyzer):
+    assert check_performance(analyzer)
 
 if __name__ == "__main__":
-    run_all_tests()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--fast', dest='mode', action='store_const', const='fast',
+                       help='run only the critical tests (1, 2, 3 and 7)')
+    group.add_argument('--full', dest='mode', action='store_const', const='full',
+                       help='run all 10 tests (default)')
+    parser.set_defaults(mode='full')
+    
+    run_all_tests(parser.parse_args().mode)